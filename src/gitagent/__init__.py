@@ -9,9 +9,32 @@ __version__ = "1.0.0"
 __author__ = "Tal Muskal"
 __email__ = "tal@a5c.ai"
 
-from .config import Settings
-from .event_handler import EventHandler
-from .models import GitHubActionTrigger, GitHubEvent
+import importlib
+from typing import Any, List
+
+# Public name -> submodule providing it, imported on first attribute access
+_LAZY_EXPORTS = {
+    "Settings": ".config",
+    "EventHandler": ".event_handler",
+    "GitHubActionTrigger": ".models",
+    "GitHubEvent": ".models",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import the public classes (and pydantic behind them) on first use."""
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    """List the lazily imported names alongside the module's own attributes."""
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
+
 
 __all__ = [
     "Settings", 
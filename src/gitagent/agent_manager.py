@@ -43,6 +43,12 @@ from .claude_code_sdk_executor import ClaudeCodeSDKExecutor
 
 logger = structlog.get_logger()
 
+# Agent directories whose agents apply to every event type
+SHARED_AGENT_DIRECTORIES = frozenset({"*", "all", "common"})
+
+# libyaml-backed safe loader when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 class AgentManager:
     """Manages AI agent discovery, configuration, and execution."""
@@ -91,52 +97,117 @@ class AgentManager:
                 "error": str(e)
             }
     
+    async def ensure_ready(
+        self,
+        github_token: Optional[str] = None,
+        agent: Optional[AgentDefinition] = None
+    ) -> None:
+        """Set up the executor and git state an agent run needs ahead of time.
+        
+        Safe to call repeatedly; components that already exist are reused.
+        """
+        if github_token is not None:
+            self._github_token = github_token
+        
+        if agent is None:
+            return
+        
+        if agent.agent.get('type') == AgentType.CLAUDE_CODE_SDK.value:
+            self._get_claude_code_sdk_executor()
+        
+        if agent.branch_automation and agent.branch_automation.enabled:
+            branch_automation = self._get_branch_automation()
+            if branch_automation:
+                try:
+                    await branch_automation.git_ops.get_current_branch()
+                except Exception as e:
+                    logger.warning("Failed to warm up branch automation", error=str(e))
+    
     async def discover_agents(
         self,
         event_type: str,
         workspace_path: Optional[str] = None
     ) -> List[AgentDefinition]:
         """Discover agents for a specific event type."""
+        agents_by_type = await self.discover_all_agents([event_type], workspace_path)
+        return agents_by_type[event_type]
+    
+    async def discover_all_agents(
+        self,
+        event_types: List[str],
+        workspace_path: Optional[str] = None
+    ) -> Dict[str, List[AgentDefinition]]:
+        """Discover agents for several event types with one walk of the agents directory.
+        
+        Agent files in the shared directories are parsed once and copied for
+        each event type instead of being re-read per event type.
+        """
         workspace_path = workspace_path or settings.github_workspace
         agents_dir = Path(workspace_path) / settings.agents_directory
         
         # Check cache first
-        cache_key = f"{event_type}:{agents_dir}"
-        if self._is_cache_valid(cache_key):
-            return self._agent_cache.get(cache_key, [])
-        
-        agents = []
+        discovered: Dict[str, List[AgentDefinition]] = {}
+        pending = []
+        for event_type in event_types:
+            cache_key = f"{event_type}:{agents_dir}"
+            if self._is_cache_valid(cache_key):
+                discovered[event_type] = self._agent_cache[cache_key]
+            else:
+                pending.append(event_type)
         
-        if not agents_dir.exists():
+        if pending and not agents_dir.exists():
             logger.info(
                 "Agents directory not found",
                 agents_directory=str(agents_dir),
-                event_type=event_type
+                event_types=pending
             )
-            return agents
-        
-        # Look for event-specific directory
-        event_dir = agents_dir / event_type
-        if event_dir.exists():
-            agents.extend(await self._load_agents_from_directory(event_dir, event_type))
-        
-        # Look for wildcard directories (e.g., "*", "all")
-        for dir_path in agents_dir.iterdir():
-            if dir_path.is_dir() and dir_path.name in ["*", "all", "common"]:
-                agents.extend(await self._load_agents_from_directory(dir_path, event_type))
+            for event_type in pending:
+                discovered[event_type] = []
+            pending = []
         
-        # Cache the results
-        self._agent_cache[cache_key] = agents
-        self._cache_timestamp = time.time()
-        
-        logger.info(
-            "Discovered agents",
-            event_type=event_type,
-            agents_count=len(agents),
-            agents_directory=str(agents_dir)
-        )
+        if pending:
+            # List the agents directory once for event-specific and shared directories
+            pending_set = set(pending)
+            event_dirs: Dict[str, Path] = {}
+            shared_dirs: List[Path] = []
+            for dir_path in agents_dir.iterdir():
+                if not dir_path.is_dir():
+                    continue
+                if dir_path.name in pending_set:
+                    event_dirs[dir_path.name] = dir_path
+                if dir_path.name in SHARED_AGENT_DIRECTORIES:
+                    shared_dirs.append(dir_path)
+            
+            shared_agents: List[AgentDefinition] = []
+            for dir_path in shared_dirs:
+                shared_agents.extend(await self._load_agents_from_directory(dir_path, pending[0]))
+            
+            for event_type in pending:
+                agents = []
+                if event_type in event_dirs:
+                    agents.extend(await self._load_agents_from_directory(event_dirs[event_type], event_type))
+                
+                for agent_def in shared_agents:
+                    if agent_def.agent["event_type"] != event_type:
+                        agent_def = agent_def.model_copy(
+                            update={"agent": {**agent_def.agent, "event_type": event_type}}
+                        )
+                    agents.append(agent_def)
+                
+                # Cache the results
+                self._agent_cache[f"{event_type}:{agents_dir}"] = agents
+                discovered[event_type] = agents
+                
+                logger.info(
+                    "Discovered agents",
+                    event_type=event_type,
+                    agents_count=len(agents),
+                    agents_directory=str(agents_dir)
+                )
+            
+            self._cache_timestamp = time.time()
         
-        return agents
+        return {event_type: discovered[event_type] for event_type in event_types}
     
     async def _load_agents_from_directory(
         self,
@@ -181,8 +252,8 @@ class AgentManager:
     ) -> Optional[AgentDefinition]:
         """Load a single agent definition from YAML file."""
         try:
-            with open(yaml_file, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
+            with open(yaml_file, 'rb') as f:
+                data = yaml.load(f, Loader=_YAML_LOADER)
             
             if not data:
                 return None
@@ -199,7 +270,7 @@ class AgentManager:
             if "name" not in data["agent"]:
                 data["agent"]["name"] = yaml_file.stem
             
-            return AgentDefinition(**data)
+            return AgentDefinition.model_validate(data)
         
         except Exception as e:
             logger.error(
@@ -78,7 +78,7 @@ class Settings(BaseSettings):
     
     # Logging Configuration
     log_level: str = Field(default="INFO", description="Logging level")
-    log_format: str = Field(default="json", description="Log format (json, console)")
+    log_format: str = Field(default="json", description="Log format (json, logfmt, console)")
     log_file: Optional[str] = Field(None, description="Log file path")
     structured_logging: bool = Field(default=True, description="Enable structured logging")
     
@@ -96,6 +96,15 @@ class Settings(BaseSettings):
     health_check_enabled: bool = Field(default=True, description="Enable health check endpoints")
     event_storage_enabled: bool = Field(default=False, description="Enable event storage")
     event_storage_path: str = Field(default="/tmp/events", description="Path to store event data")
+    diff_cache_enabled: bool = Field(
+        default=False,
+        description="Cache file changes, including patch text, per commit range on disk (opt-in)"
+    )
+    diff_cache_path: str = Field(
+        default="~/.cache/gitagent/diff-cache",
+        description="Directory for the commit range diff cache"
+    )
+    diff_cache_max_entries: int = Field(default=10, description="Cached commit ranges kept per repository")
     
     # Event Configuration
     enabled_events: Optional[List[str]] = Field(None, description="Enabled event types (empty = all)")
@@ -138,7 +147,7 @@ class Settings(BaseSettings):
     @classmethod
     def validate_log_format(cls, v):
         """Validate log format."""
-        valid_formats = {"json", "console"}
+        valid_formats = {"json", "logfmt", "console"}
         if v.lower() not in valid_formats:
             raise ValueError(f"Log format must be one of: {', '.join(valid_formats)}")
         return v.lower()
@@ -25,6 +25,7 @@ from .models import (
     GitHubActionContext,
 )
 from .agent_manager import AgentManager
+from .logging_config import RequestLogCtx
 
 logger = structlog.get_logger(__name__)
 
@@ -393,21 +394,7 @@ class GitHubActionEventProcessor:
     
     def _get_github_context(self) -> GitHubActionContext:
         """Get GitHub Action context from environment variables."""
-        return GitHubActionContext(
-            event_name=os.getenv("GITHUB_EVENT_NAME", "unknown"),
-            workflow=os.getenv("GITHUB_WORKFLOW", "unknown"),
-            job=os.getenv("GITHUB_JOB", "unknown"),
-            run_id=os.getenv("GITHUB_RUN_ID", "0"),
-            run_number=int(os.getenv("GITHUB_RUN_NUMBER", "0")),
-            actor=os.getenv("GITHUB_ACTOR", "unknown"),
-            repository=os.getenv("GITHUB_REPOSITORY", "unknown"),
-            ref=os.getenv("GITHUB_REF", "refs/heads/main"),
-            sha=os.getenv("GITHUB_SHA", "unknown"),
-            workspace=os.getenv("GITHUB_WORKSPACE", os.getcwd()),
-            server_url=os.getenv("GITHUB_SERVER_URL", "https://github.com"),
-            api_url=os.getenv("GITHUB_API_URL", "https://api.github.com"),
-            graphql_url=os.getenv("GITHUB_GRAPHQL_URL", "https://api.github.com/graphql")
-        )
+        return GitHubActionContext.from_env()
     
     async def process_event(self, event: GitHubEvent) -> EventProcessingResult:
         """Process a GitHub event."""
@@ -421,10 +408,13 @@ class GitHubActionEventProcessor:
         event_type = context.event_name
         self.stats["events_by_type"][event_type] = self.stats["events_by_type"].get(event_type, 0) + 1
         
+        # Attach the per-event fields once for every log line below
+        log = RequestLogCtx(self.logger, event_type=event_type, repository=context.repository)
+        
         try:
             # Check if event is enabled
             if not self._is_event_enabled(event_type):
-                self.logger.info("Event type is disabled, skipping", event_type=event_type)
+                log.info("Event type is disabled, skipping")
                 return EventProcessingResult(
                     event_type=event_type,
                     processing_time=time.time() - start_time,
@@ -445,12 +435,10 @@ class GitHubActionEventProcessor:
             else:
                 self.stats["failed_events"] += 1
             
-            self.logger.info(
+            log.info(
                 "Event processed",
-                event_type=event_type,
                 success=result.success,
-                processing_time=result.processing_time,
-                repository=context.repository
+                processing_time=result.processing_time
             )
             
             return result
@@ -459,9 +447,8 @@ class GitHubActionEventProcessor:
             self.stats["failed_events"] += 1
             processing_time = time.time() - start_time
             
-            self.logger.error(
+            log.error(
                 "Event processing failed",
-                event_type=event_type,
                 error=str(e),
                 processing_time=processing_time
             )
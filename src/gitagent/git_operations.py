@@ -9,16 +9,23 @@ This module provides functionality for:
 """
 
 import asyncio
+import functools
+import gzip
+import hashlib
+import json
 import logging
 import os
+import re
 import subprocess
 import tempfile
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Any, Union
 from urllib.parse import urlparse
 
 import httpx
+import orjson
 from jinja2 import Template
 
 from .models import (
@@ -31,6 +38,34 @@ from .config import Settings
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of paths passed to a single `git add` to stay below ARG_MAX
+GIT_ADD_BATCH_SIZE = 500
+
+# Upper bound for a single streamed git output record or patch line
+GIT_STREAM_LIMIT = 32 * 1024 * 1024
+
+# Only immutable commit SHAs are used as diff cache keys
+COMMIT_SHA_RE = re.compile(r'^[0-9a-f]{40}([0-9a-f]{24})?$')
+
+# Shared pool for CPU-heavy template rendering, capped to limit concurrent work
+_RENDER_EXECUTOR = ThreadPoolExecutor(
+    max_workers=min(4, os.cpu_count() or 1),
+    thread_name_prefix="gitagent-render"
+)
+
+
+def _build_status_table() -> Tuple[str, ...]:
+    """Build a lookup table from git status letter byte to normalized status."""
+    table = ['modified'] * 256  # Includes 'T' (type change) and 'U' (unmerged)
+    table[ord('A')] = 'added'
+    table[ord('D')] = 'removed'
+    table[ord('R')] = 'renamed'
+    table[ord('C')] = 'copied'
+    return tuple(table)
+
+
+_STATUS_TABLE = _build_status_table()
+
 
 class GitOperationError(Exception):
     """Raised when git operations fail."""
@@ -49,6 +84,9 @@ class GitOperations:
         self.settings = settings
         self.workspace_path = Path(workspace_path)
         self.git_executable = self._find_git_executable()
+        self._current_branch: Optional[str] = None
+        self._remote_url: Optional[str] = None
+        self._diff_cache: Dict[Tuple[str, str, int], Dict[str, str]] = {}
     
     def _find_git_executable(self) -> str:
         """Find git executable path."""
@@ -64,11 +102,16 @@ class GitOperations:
         
         raise GitOperationError("Git executable not found")
     
-    async def run_git_command(self, args: List[str], cwd: Optional[Path] = None) -> Tuple[str, str]:
-        """Run a git command asynchronously."""
+    async def run_git_command_bytes(self, args: List[str],
+                                    cwd: Optional[Path] = None) -> Tuple[bytes, bytes]:
+        """Run a git command asynchronously and return raw, undecoded output."""
         cmd = [self.git_executable] + args
         work_dir = cwd or self.workspace_path
         
+        # Any checkout may move HEAD, so drop the cached branch name
+        if args and args[0] in ('checkout', 'switch'):
+            self._current_branch = None
+        
         logger.debug(f"Running git command: {' '.join(cmd)} in {work_dir}")
         
         try:
@@ -81,54 +124,87 @@ class GitOperations:
             
             stdout, stderr = await process.communicate()
             
-            stdout_str = stdout.decode('utf-8').strip()
-            stderr_str = stderr.decode('utf-8').strip()
-            
             if process.returncode != 0:
+                stderr_str = stderr.decode('utf-8', errors='replace').strip()
                 raise GitOperationError(f"Git command failed: {stderr_str}")
             
-            return stdout_str, stderr_str
+            return stdout, stderr
             
+        except GitOperationError:
+            raise
         except asyncio.TimeoutError:
             raise GitOperationError("Git command timed out")
         except Exception as e:
             raise GitOperationError(f"Git command error: {e}")
     
+    async def run_git_command(self, args: List[str], cwd: Optional[Path] = None) -> Tuple[str, str]:
+        """Run a git command asynchronously."""
+        stdout, stderr = await self.run_git_command_bytes(args, cwd)
+        
+        try:
+            return stdout.decode('utf-8').strip(), stderr.decode('utf-8').strip()
+        except UnicodeDecodeError as e:
+            raise GitOperationError(f"Git command error: {e}")
+    
     async def get_current_branch(self) -> str:
         """Get the current branch name."""
-        stdout, _ = await self.run_git_command(['branch', '--show-current'])
-        return stdout.strip()
+        if self._current_branch is not None:
+            return self._current_branch
+        
+        # Read HEAD directly when it is a symbolic ref; fall back to git for
+        # detached HEADs and worktrees where .git is not a directory
+        try:
+            head = (self.workspace_path / '.git' / 'HEAD').read_text(encoding='utf-8').strip()
+        except OSError:
+            head = ''
+        
+        if head.startswith('ref: refs/heads/'):
+            branch = head[len('ref: refs/heads/'):]
+        else:
+            stdout, _ = await self.run_git_command(['branch', '--show-current'])
+            branch = stdout.strip()
+        
+        self._current_branch = branch
+        return branch
     
     async def get_remote_url(self) -> str:
         """Get the remote origin URL."""
-        stdout, _ = await self.run_git_command(['remote', 'get-url', 'origin'])
-        return stdout.strip()
+        if self._remote_url is None:
+            stdout, _ = await self.run_git_command(['remote', 'get-url', 'origin'])
+            self._remote_url = stdout.strip()
+        return self._remote_url
     
     async def create_branch(self, branch_name: str, base_branch: Optional[str] = None) -> str:
         """Create a new branch."""
         if base_branch:
-            await self.run_git_command(['checkout', base_branch])
-            await self.run_git_command(['pull', 'origin', base_branch])
-        
-        # Create and checkout new branch
-        await self.run_git_command(['checkout', '-b', branch_name])
+            # Fetch the base without switching to it, then branch straight off
+            # the fetched commit to avoid an extra working-tree checkout
+            await self.run_git_command(['fetch', 'origin', base_branch])
+            await self.run_git_command(['checkout', '-b', branch_name, 'FETCH_HEAD'])
+        else:
+            # Create and checkout new branch
+            await self.run_git_command(['checkout', '-b', branch_name])
+        self._current_branch = branch_name
         
         logger.info(f"Created branch: {branch_name}")
         return branch_name
     
     async def commit_changes(self, message: str, files: Optional[List[str]] = None) -> str:
         """Commit changes to the current branch."""
-        # Add files (all changes if none specified)
+        # Add files (all changes if none specified), batching paths per invocation
         if files:
-            for file in files:
-                await self.run_git_command(['add', file])
+            files = list(files)
+            for i in range(0, len(files), GIT_ADD_BATCH_SIZE):
+                await self.run_git_command(['add', '--'] + files[i:i + GIT_ADD_BATCH_SIZE])
         else:
             await self.run_git_command(['add', '.'])
         
         # Check if there are changes to commit
         try:
-            stdout, _ = await self.run_git_command(['diff', '--cached', '--name-only'])
-            if not stdout.strip():
+            stdout, _ = await self.run_git_command([
+                'status', '--porcelain=v2', '-z', '--untracked-files=no'
+            ])
+            if not self._has_staged_changes(stdout):
                 logger.info("No changes to commit")
                 return ""
         except GitOperationError:
@@ -145,87 +221,269 @@ class GitOperations:
         logger.info(f"Committed changes: {commit_sha}")
         return commit_sha
     
+    def _has_staged_changes(self, status_output: str) -> bool:
+        """Check `git status --porcelain=v2 -z` output for staged entries."""
+        records = status_output.split('\0')
+        i = 0
+        while i < len(records):
+            record = records[i]
+            i += 1
+            if not record or record[0] not in '12u':
+                continue
+            if record[0] == '2':
+                # Renamed/copied entries carry the original path as an extra record
+                i += 1
+            if record[2] != '.':
+                return True
+        return False
+    
     async def push_branch(self, branch_name: str) -> None:
         """Push branch to remote."""
         await self.run_git_command(['push', 'origin', branch_name])
         logger.info(f"Pushed branch: {branch_name}")
     
+    async def _get_diff_cache_file(self, base_sha: str, head_sha: str,
+                                   suffix: str = '') -> Optional[Path]:
+        """Get the disk cache file for a commit range, if caching applies."""
+        if not self.settings.diff_cache_enabled:
+            return None
+        if not (COMMIT_SHA_RE.match(base_sha) and COMMIT_SHA_RE.match(head_sha)):
+            return None
+        
+        try:
+            remote_url = await self.get_remote_url()
+        except GitOperationError:
+            return None
+        
+        remote_hash = hashlib.md5(remote_url.encode('utf-8')).hexdigest()
+        cache_dir = Path(self.settings.diff_cache_path).expanduser() / remote_hash
+        return cache_dir / f"{base_sha}..{head_sha}{suffix}.json.gz"
+    
+    def _read_diff_cache(self, cache_file: Path) -> Optional[List[FileChange]]:
+        """Load cached file changes and mark the entry as recently used."""
+        try:
+            with gzip.open(cache_file, 'rt', encoding='utf-8') as f:
+                data = json.load(f)
+            os.utime(cache_file)
+            return [FileChange(**fc) for fc in data]
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable diff cache entry {cache_file}: {e}")
+            return None
+    
+    def _write_diff_cache(self, cache_file: Path, file_changes: List[FileChange]) -> None:
+        """Atomically store file changes and prune least recently used entries."""
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=cache_file.parent, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb') as gz:
+                    gz.write(json.dumps([fc.dict() for fc in file_changes]).encode('utf-8'))
+                os.replace(tmp_path, cache_file)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+            
+            entries = sorted(
+                cache_file.parent.glob('*.json.gz'),
+                key=lambda p: p.stat().st_mtime,
+                reverse=True
+            )
+            for stale in entries[self.settings.diff_cache_max_entries:]:
+                stale.unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning(f"Could not write diff cache entry {cache_file}: {e}")
+    
     async def get_file_changes(self, base_sha: str, head_sha: str) -> List[FileChange]:
         """Get list of changed files between two commits."""
+        cache_file = await self._get_diff_cache_file(base_sha, head_sha)
+        if cache_file:
+            cached = await asyncio.to_thread(self._read_diff_cache, cache_file)
+            if cached is not None:
+                return cached
+        
+        file_changes = await self._collect_file_changes(base_sha, head_sha)
+        
+        if cache_file and file_changes:
+            await asyncio.to_thread(self._write_diff_cache, cache_file, file_changes)
+        return file_changes
+    
+    async def _collect_file_changes(self, base_sha: str, head_sha: str) -> List[FileChange]:
+        """Run git to collect changed files between two commits."""
         try:
-            # Get list of changed files
-            stdout, _ = await self.run_git_command([
-                'diff', '--name-status', f"{base_sha}..{head_sha}"
-            ])
-            
-            file_changes = []
-            for line in stdout.split('\n'):
-                if not line.strip():
-                    continue
-                
-                parts = line.split('\t', 1)
-                if len(parts) < 2:
-                    continue
-                
-                status = parts[0]
-                filename = parts[1]
-                
-                # Get diff stats
-                try:
-                    stats_stdout, _ = await self.run_git_command([
-                        'diff', '--numstat', f"{base_sha}..{head_sha}", '--', filename
-                    ])
-                    
-                    additions, deletions = 0, 0
-                    if stats_stdout.strip():
-                        stats_parts = stats_stdout.split('\t')
-                        if len(stats_parts) >= 2:
-                            try:
-                                additions = int(stats_parts[0]) if stats_parts[0] != '-' else 0
-                                deletions = int(stats_parts[1]) if stats_parts[1] != '-' else 0
-                            except ValueError:
-                                pass
-                    
-                    file_change = FileChange(
-                        filename=filename,
-                        status=self._normalize_status(status),
-                        additions=additions,
-                        deletions=deletions,
-                        changes=additions + deletions
-                    )
-                    
-                    file_changes.append(file_change)
-                    
-                except GitOperationError as e:
-                    logger.warning(f"Could not get stats for {filename}: {e}")
-            
-            return file_changes
-            
+            return [fc async for fc in self.iter_file_changes(base_sha, head_sha)]
         except GitOperationError as e:
             logger.error(f"Failed to get file changes: {e}")
             return []
     
-    async def get_file_diff(self, filename: str, base_sha: str, head_sha: str, 
-                           context_lines: int = 3) -> Optional[str]:
-        """Get diff for a specific file."""
+    async def get_full_diff(self, base_sha: str, head_sha: str,
+                            context_lines: int = 3) -> List[FileChange]:
+        """Get changed files with stats and patches from a single git diff pass."""
+        cache_file = await self._get_diff_cache_file(base_sha, head_sha, f"-U{context_lines}")
+        if cache_file:
+            cached = await asyncio.to_thread(self._read_diff_cache, cache_file)
+            if cached is not None:
+                return cached
+        
         try:
-            stdout, _ = await self.run_git_command([
-                'diff', f"--unified={context_lines}", f"{base_sha}..{head_sha}", '--', filename
-            ])
-            return stdout if stdout.strip() else None
+            file_changes = [
+                fc async for fc in self.iter_file_changes(base_sha, head_sha, context_lines)
+            ]
         except GitOperationError as e:
-            logger.warning(f"Could not get diff for {filename}: {e}")
-            return None
+            logger.error(f"Failed to get full diff: {e}")
+            return []
+        
+        if cache_file and file_changes:
+            await asyncio.to_thread(self._write_diff_cache, cache_file, file_changes)
+        return file_changes
+    
+    async def iter_file_changes(
+        self,
+        base_sha: str,
+        head_sha: str,
+        context_lines: Optional[int] = None
+    ) -> AsyncIterator[FileChange]:
+        """Stream changed files between two commits as git produces them.
+        
+        Runs a single `git diff-tree -z --raw --numstat` (plus `--patch` when
+        ``context_lines`` is given). Git writes NUL-separated raw records, then
+        the same number of numstat records, then an empty record followed by
+        the patch text with one `diff --git` section per file in raw-record
+        order. Each file is yielded as soon as its patch section is complete,
+        so callers can start working on the first file while git is still
+        diffing the rest. Only paths and patch sections are decoded.
+        """
+        args = ['diff-tree', '-r', '-z', '-M', '--raw', '--numstat', '--no-commit-id']
+        if context_lines is not None:
+            args += ['--patch', f"--unified={context_lines}"]
+        args += [base_sha, head_sha]
+        
+        logger.debug(f"Streaming git command: git {' '.join(args)} in {self.workspace_path}")
+        
+        try:
+            process = await asyncio.create_subprocess_exec(
+                self.git_executable, *args,
+                cwd=self.workspace_path,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                limit=GIT_STREAM_LIMIT
+            )
+        except Exception as e:
+            raise GitOperationError(f"Git command error: {e}")
+        
+        # Drain stderr concurrently so a chatty git can't block on a full pipe
+        stderr_task = asyncio.ensure_future(process.stderr.read())
+        stdout = process.stdout
+        
+        async def next_token() -> bytes:
+            try:
+                return (await stdout.readuntil(b'\0'))[:-1]
+            except asyncio.IncompleteReadError as e:
+                return e.partial
+        
+        def make_change(index: int, patch_lines: Optional[List[bytes]]) -> FileChange:
+            status, filename = entries[index]
+            additions, deletions = stats[index] if index < len(stats) else (0, 0)
+            patch = None
+            if patch_lines:
+                patch = b''.join(patch_lines).rstrip(b'\n').decode('utf-8', errors='replace')
+            return FileChange(
+                filename=filename,
+                status=self._normalize_status(status),
+                additions=additions,
+                deletions=deletions,
+                changes=additions + deletions,
+                patch=patch
+            )
+        
+        try:
+            # Raw records: ":<modes> <shas> <status>" followed by one or two
+            # paths; the first record not starting with ':' begins numstat
+            entries = []
+            token = await next_token()
+            while token.startswith(b':'):
+                status = token.rsplit(b' ', 1)[-1]
+                if status[:1] in (b'R', b'C'):
+                    await next_token()  # Original path
+                entries.append((status, (await next_token()).decode('utf-8', errors='replace')))
+                token = await next_token()
+            
+            # Numstat records: "<adds>\t<dels>\t<path>" or, for renames,
+            # "<adds>\t<dels>\t" followed by the old and new paths
+            stats = []
+            while token and len(stats) < len(entries):
+                adds, dels, path = token.split(b'\t', 2)
+                if not path:
+                    await next_token()
+                    await next_token()
+                stats.append((
+                    int(adds) if adds != b'-' else 0,
+                    int(dels) if dels != b'-' else 0
+                ))
+                token = await next_token() if len(stats) < len(entries) else b''
+            
+            if context_lines is None:
+                for index in range(len(entries)):
+                    yield make_change(index, None)
+            else:
+                # Skip the empty separator record, then split the patch text
+                # on section headers; file lines are always prefixed, so a
+                # line starting with "diff --git " is always a new section
+                await next_token()
+                index = -1
+                section: List[bytes] = []
+                while line := await stdout.readline():
+                    if line.startswith(b'diff --git '):
+                        if index >= 0 and index < len(entries):
+                            yield make_change(index, section)
+                        index += 1
+                        section = []
+                    section.append(line)
+                if 0 <= index < len(entries):
+                    yield make_change(index, section)
+                for remaining in range(index + 1, len(entries)):
+                    yield make_change(remaining, None)
+            
+            await process.wait()
+            stderr = await stderr_task
+            if process.returncode != 0:
+                stderr_str = stderr.decode('utf-8', errors='replace').strip()
+                raise GitOperationError(f"Git command failed: {stderr_str}")
+        except (asyncio.LimitOverrunError, ValueError) as e:
+            raise GitOperationError(f"Git command error: {e}")
+        finally:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            if not stderr_task.done():
+                stderr_task.cancel()
+    
+    async def get_file_diff(self, filename: str, base_sha: str, head_sha: str, 
+                           context_lines: int = 3) -> Optional[str]:
+        """Get diff for a specific file.
+        
+        The whole commit range is diffed once on first use and the per-file
+        patches are memoized, so repeated calls are dictionary lookups.
+        """
+        key = (base_sha, head_sha, context_lines)
+        patches = self._diff_cache.get(key)
+        if patches is None:
+            file_changes = await self.get_full_diff(base_sha, head_sha, context_lines)
+            patches = {fc.filename: fc.patch for fc in file_changes if fc.patch}
+            self._diff_cache[key] = patches
+        return patches.get(filename)
     
     async def get_file_content(self, filename: str, commit_sha: Optional[str] = None) -> Optional[str]:
         """Get file content at a specific commit."""
         try:
             if commit_sha:
-                stdout, _ = await self.run_git_command(['show', f"{commit_sha}:{filename}"])
+                content, _ = await self.run_git_command_bytes(['show', f"{commit_sha}:{filename}"])
+                stdout = content.decode('utf-8')
             else:
                 file_path = self.workspace_path / filename
                 if file_path.exists():
-                    stdout = file_path.read_text(encoding='utf-8')
+                    stdout = await asyncio.to_thread(file_path.read_text, encoding='utf-8')
                 else:
                     return None
             return stdout
@@ -233,18 +491,12 @@ class GitOperations:
             logger.warning(f"Could not get content for {filename}: {e}")
             return None
     
-    def _normalize_status(self, status: str) -> str:
+    def _normalize_status(self, status: Union[str, bytes]) -> str:
         """Normalize git status to standard format."""
-        status_map = {
-            'A': 'added',
-            'M': 'modified',
-            'D': 'removed',
-            'R': 'renamed',
-            'C': 'copied',
-            'T': 'modified',  # Type change
-            'U': 'modified',  # Unmerged
-        }
-        return status_map.get(status[0], 'modified')
+        code = status[0]
+        if isinstance(code, str):
+            code = ord(code) if code.isascii() else 0
+        return _STATUS_TABLE[code]
     
     def generate_branch_name(self, prefix: str) -> str:
         """Generate a unique branch name."""
@@ -259,6 +511,11 @@ class GitHubAPI:
         self.settings = settings
         self.github_token = github_token
         self.base_url = "https://api.github.com"
+        self._headers = httpx.Headers({
+            "Authorization": f"token {github_token}",
+            "Accept": "application/vnd.github.v3+json",
+            "User-Agent": "GitHub-Action-Handler/1.0"
+        })
         
     async def create_pull_request(
         self,
@@ -284,32 +541,26 @@ class GitHubAPI:
             "draft": False
         }
         
-        headers = {
-            "Authorization": f"token {self.github_token}",
-            "Accept": "application/vnd.github.v3+json",
-            "User-Agent": "GitHub-Action-Handler/1.0"
-        }
-        
         try:
             async with httpx.AsyncClient() as client:
-                response = await client.post(url, json=data, headers=headers)
+                response = await client.post(url, json=data, headers=self._headers)
                 
                 if response.status_code == 201:
-                    pr_data = response.json()
+                    pr_data = orjson.loads(response.content)
                     pr_number = pr_data["number"]
                     pr_url = pr_data["html_url"]
                     
                     # Add labels if specified
                     if labels:
-                        await self._add_labels(client, owner, repo, pr_number, labels, headers)
+                        await self._add_labels(client, owner, repo, pr_number, labels)
                     
                     # Add assignees if specified
                     if assignees:
-                        await self._add_assignees(client, owner, repo, pr_number, assignees, headers)
+                        await self._add_assignees(client, owner, repo, pr_number, assignees)
                     
                     # Request reviewers if specified
                     if reviewers:
-                        await self._request_reviewers(client, owner, repo, pr_number, reviewers, headers)
+                        await self._request_reviewers(client, owner, repo, pr_number, reviewers)
                     
                     logger.info(f"Created PR #{pr_number}: {pr_url}")
                     return pr_number, pr_url
@@ -324,26 +575,26 @@ class GitHubAPI:
             raise GitHubAPIError(error_msg)
     
     async def _add_labels(self, client: httpx.AsyncClient, owner: str, repo: str, 
-                         issue_number: int, labels: List[str], headers: Dict[str, str]) -> None:
+                         issue_number: int, labels: List[str]) -> None:
         """Add labels to an issue or PR."""
         url = f"{self.base_url}/repos/{owner}/{repo}/issues/{issue_number}/labels"
-        response = await client.post(url, json={"labels": labels}, headers=headers)
+        response = await client.post(url, json={"labels": labels}, headers=self._headers)
         if response.status_code != 200:
             logger.warning(f"Failed to add labels: {response.status_code}")
     
     async def _add_assignees(self, client: httpx.AsyncClient, owner: str, repo: str,
-                            issue_number: int, assignees: List[str], headers: Dict[str, str]) -> None:
+                            issue_number: int, assignees: List[str]) -> None:
         """Add assignees to an issue or PR."""
         url = f"{self.base_url}/repos/{owner}/{repo}/issues/{issue_number}/assignees"
-        response = await client.post(url, json={"assignees": assignees}, headers=headers)
+        response = await client.post(url, json={"assignees": assignees}, headers=self._headers)
         if response.status_code != 201:
             logger.warning(f"Failed to add assignees: {response.status_code}")
     
     async def _request_reviewers(self, client: httpx.AsyncClient, owner: str, repo: str,
-                                pr_number: int, reviewers: List[str], headers: Dict[str, str]) -> None:
+                                pr_number: int, reviewers: List[str]) -> None:
         """Request reviewers for a PR."""
         url = f"{self.base_url}/repos/{owner}/{repo}/pulls/{pr_number}/requested_reviewers"
-        response = await client.post(url, json={"reviewers": reviewers}, headers=headers)
+        response = await client.post(url, json={"reviewers": reviewers}, headers=self._headers)
         if response.status_code != 201:
             logger.warning(f"Failed to request reviewers: {response.status_code}")
     
@@ -369,15 +620,9 @@ class GitHubAPI:
         if target_url:
             data["target_url"] = target_url
         
-        headers = {
-            "Authorization": f"token {self.github_token}",
-            "Accept": "application/vnd.github.v3+json",
-            "User-Agent": "GitHub-Action-Handler/1.0"
-        }
-        
         try:
             async with httpx.AsyncClient() as client:
-                response = await client.post(url, json=data, headers=headers)
+                response = await client.post(url, json=data, headers=self._headers)
                 
                 if response.status_code == 201:
                     logger.info(f"Created status check: {context} - {state}")
@@ -397,26 +642,28 @@ class GitHubAPI:
         owner: str,
         repo: str,
         issue_number: int,
-        body: str
+        body: str,
+        return_url: bool = True
     ) -> Optional[str]:
-        """Create a comment on an issue or PR."""
+        """Create a comment on an issue or PR.
+        
+        Returns the comment's HTML URL. With ``return_url=False`` the response
+        body is not parsed and the API URL from the ``Location`` header is
+        returned instead, or None if the header is missing.
+        """
         url = f"{self.base_url}/repos/{owner}/{repo}/issues/{issue_number}/comments"
         
         data = {"body": body}
         
-        headers = {
-            "Authorization": f"token {self.github_token}",
-            "Accept": "application/vnd.github.v3+json",
-            "User-Agent": "GitHub-Action-Handler/1.0"
-        }
-        
         try:
             async with httpx.AsyncClient() as client:
-                response = await client.post(url, json=data, headers=headers)
+                response = await client.post(url, json=data, headers=self._headers)
                 
                 if response.status_code == 201:
-                    comment_data = response.json()
-                    comment_url = comment_data["html_url"]
+                    if not return_url:
+                        logger.info(f"Created comment on #{issue_number}")
+                        return response.headers.get("Location")
+                    comment_url = orjson.loads(response.content)["html_url"]
                     logger.info(f"Created comment: {comment_url}")
                     return comment_url
                 else:
@@ -454,18 +701,12 @@ class GitHubAPI:
         if milestone:
             data["milestone"] = milestone
         
-        headers = {
-            "Authorization": f"token {self.github_token}",
-            "Accept": "application/vnd.github.v3+json",
-            "User-Agent": "GitHub-Action-Handler/1.0"
-        }
-        
         try:
             async with httpx.AsyncClient() as client:
-                response = await client.post(url, json=data, headers=headers)
+                response = await client.post(url, json=data, headers=self._headers)
                 
                 if response.status_code == 201:
-                    issue_data = response.json()
+                    issue_data = orjson.loads(response.content)
                     issue_number = issue_data["number"]
                     issue_url = issue_data["html_url"]
                     logger.info(f"Created issue #{issue_number}: {issue_url}")
@@ -586,9 +827,12 @@ class BranchAutomationManager:
         # In the future, this could be enhanced to parse and apply specific changes
         output_file = self.workspace_path / f"{agent_name}-output.md"
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(f"# Agent Output: {agent_name}\n\n")
-            f.write(agent_output)
+        # Write off the event loop so large outputs don't stall other I/O
+        await asyncio.to_thread(
+            output_file.write_text,
+            f"# Agent Output: {agent_name}\n\n{agent_output}",
+            encoding='utf-8'
+        )
         
         logger.info(f"Applied agent changes to {output_file}")
     
@@ -606,12 +850,18 @@ class BranchAutomationManager:
                 from .models import FileChange
                 files_changed = [FileChange(**fc) for fc in files_changed]
             
-            return render_template_with_file_inclusion(
-                template_str=template_str,
-                context_vars=variables,
-                workspace_path=self.workspace_path,
-                files_changed=files_changed,
-                github_context=None  # We don't have GitHubActionContext object here
+            # Render on a bounded pool so file inclusion doesn't block the event loop
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                _RENDER_EXECUTOR,
+                functools.partial(
+                    render_template_with_file_inclusion,
+                    template_str=template_str,
+                    context_vars=variables,
+                    workspace_path=self.workspace_path,
+                    files_changed=files_changed,
+                    github_context=None  # We don't have GitHubActionContext object here
+                )
             )
         except Exception as e:
             logger.warning(f"Template rendering failed: {e}")
@@ -637,16 +887,14 @@ async def extract_file_changes_from_event(
     
     # Handle push events
     if hasattr(event, 'before') and hasattr(event, 'after') and event.before and event.after:
-        file_changes = await git_ops.get_file_changes(event.before, event.after)
+        if include_diff:
+            # Stats and patches for every file come from one git invocation
+            file_changes = await git_ops.get_full_diff(event.before, event.after, diff_context)
+        else:
+            file_changes = await git_ops.get_file_changes(event.before, event.after)
         
-        # Enhance with content and diffs if requested
+        # Enhance with content if requested
         for file_change in file_changes:
-            if include_diff:
-                diff = await git_ops.get_file_diff(
-                    file_change.filename, event.before, event.after, diff_context
-                )
-                file_change.patch = diff
-            
             if include_content:
                 # Get content before and after
                 file_change.content_before = await git_ops.get_file_content(
@@ -5,16 +5,88 @@ This module sets up comprehensive structured logging using structlog with
 JSON output, performance metrics, security logging, and flexible configuration.
 """
 
+import atexit
+import bisect
 import logging
 import logging.handlers
+import os
+import queue
+import re
 import sys
+import threading
 from typing import Any, Dict, Optional
 
+import orjson
 import structlog
 from structlog.types import EventDict, Processor
 
 from .config import Settings
 
+# Static per-process metadata, computed once instead of per log record
+_PID = os.getpid()
+_APP_INFO = {"app_name": "github-action-handler", "app_version": "1.0.0"}
+
+# Common sensitive keys, checked by hash before falling back to the regex
+_EXACT_SENSITIVE = frozenset({
+    "token", "secret", "password", "key", "authorization",
+    "x-hub-signature", "x-hub-signature-256", "webhook_secret",
+    "api_key", "access_token", "github_token", "private_key",
+})
+
+# Matches any key containing a sensitive substring, in a single C-level scan
+_SENSITIVE_RE = re.compile(
+    r"token|secret|password|key|authorization|x-hub-signature(?:-256)?|webhook_secret"
+)
+
+# Event dict keys renamed by add_github_context
+_GITHUB_CONTEXT_KEYS = (
+    ("event_type", "github_event_type"),
+    ("delivery_id", "github_delivery_id"),
+    ("repository", "github_repository"),
+    ("sender", "github_sender"),
+)
+
+_SECURITY_EVENTS = frozenset({
+    "security_advisory", "vulnerability_alert", "dependabot_alert",
+    "code_scanning_alert", "secret_scanning_alert"
+})
+
+# Upper bounds (exclusive, in ms) for each performance category
+_PERF_BUCKETS = (100, 1000, 5000)
+_PERF_LABELS = ("fast", "normal", "slow", "very_slow")
+
+# Formatters for the file handler, shared across setup calls
+_MESSAGE_FORMATTER = logging.Formatter("%(message)s")
+_TEXT_FORMATTER = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+# File log buffer size in bytes, and how often (seconds) it is flushed
+_LOG_BUFFER_SIZE = 64 * 1024
+_LOG_FLUSH_INTERVAL = 0.5
+
+# Loggers handed out by get_logger, keyed by name
+_LOGGER_CACHE: Dict[str, Any] = {}
+
+# Background thread that performs file log writes, if file logging is set up,
+# along with the root queue handler feeding it and the file handler it drives
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[logging.handlers.QueueHandler] = None
+_file_handler: Optional[logging.Handler] = None
+
+
+def _reset_pid() -> None:
+    """Refresh the cached PID in forked children."""
+    global _PID
+    _PID = os.getpid()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_pid)
+
+
+def _orjson_dumps(obj: Any, default: Any = None, **kwargs: Any) -> str:
+    """Serialize a log record to compact JSON with orjson."""
+    return orjson.dumps(obj, default=default).decode()
+
 
 def add_log_level(logger: Any, method_name: str, event_dict: EventDict) -> EventDict:
     """Add log level to the event dictionary."""
@@ -22,130 +94,150 @@ def add_log_level(logger: Any, method_name: str, event_dict: EventDict) -> Event
     return event_dict
 
 
-def add_timestamp(logger: Any, method_name: str, event_dict: EventDict) -> EventDict:
-    """Add timestamp to the event dictionary."""
-    import time
-    event_dict["timestamp"] = time.time()
-    return event_dict
-
-
 def add_process_info(logger: Any, method_name: str, event_dict: EventDict) -> EventDict:
     """Add process information to the event dictionary."""
-    import os
-    event_dict["process_id"] = os.getpid()
+    event_dict["process_id"] = _PID
     return event_dict
 
 
 def add_app_info(logger: Any, method_name: str, event_dict: EventDict) -> EventDict:
     """Add application information to the event dictionary."""
-    event_dict["app_name"] = "github-action-handler"
-    event_dict["app_version"] = "1.0.0"
+    event_dict.update(_APP_INFO)
     return event_dict
 
 
 def add_github_context(logger: Any, method_name: str, event_dict: EventDict) -> EventDict:
     """Add GitHub-specific context to logs."""
-    # Extract GitHub-specific information if present
-    if "event_type" in event_dict:
-        event_dict["github_event_type"] = event_dict["event_type"]
+    # Rename GitHub-specific fields in place rather than duplicating them
+    for source, target in _GITHUB_CONTEXT_KEYS:
+        if source in event_dict:
+            event_dict[target] = event_dict.pop(source)
     
-    if "delivery_id" in event_dict:
-        event_dict["github_delivery_id"] = event_dict["delivery_id"]
+    return event_dict
+
+
+class _RedactNode:
+    """A container visited while filtering, linked to where it is stored."""
     
-    if "repository" in event_dict:
-        event_dict["github_repository"] = event_dict["repository"]
+    __slots__ = ("container", "parent", "key", "owned")
     
-    if "sender" in event_dict:
-        event_dict["github_sender"] = event_dict["sender"]
+    def __init__(self, container: Any, parent: Optional["_RedactNode"], key: Any, owned: bool):
+        self.container = container
+        self.parent = parent
+        self.key = key
+        self.owned = owned
+
+
+def _own_container(node: _RedactNode) -> None:
+    """Replace a node and its ancestors with private copies before writing."""
+    chain = []
+    while not node.owned:
+        chain.append(node)
+        node = node.parent
     
-    return event_dict
+    for node in reversed(chain):
+        copy = dict(node.container) if isinstance(node.container, dict) else list(node.container)
+        node.parent.container[node.key] = copy
+        node.container = copy
+        node.owned = True
 
 
 def filter_sensitive_data(logger: Any, method_name: str, event_dict: EventDict) -> EventDict:
-    """Filter out sensitive data from logs."""
-    sensitive_keys = {
-        "token", "secret", "password", "key", "authorization", 
-        "x-hub-signature", "x-hub-signature-256", "webhook_secret"
-    }
+    """Filter out sensitive data from logs.
     
-    def filter_dict(d: Dict[str, Any]) -> Dict[str, Any]:
-        """Recursively filter sensitive data from dictionary."""
-        filtered = {}
-        for key, value in d.items():
-            key_lower = key.lower()
-            if any(sensitive in key_lower for sensitive in sensitive_keys):
-                filtered[key] = "[REDACTED]"
-            elif isinstance(value, dict):
-                filtered[key] = filter_dict(value)
-            elif isinstance(value, list):
-                filtered[key] = [
-                    filter_dict(item) if isinstance(item, dict) else item 
-                    for item in value
-                ]
-            else:
-                filtered[key] = value
-        return filtered
-    
-    return filter_dict(event_dict)
+    The event dict is walked with an explicit stack and redacted in place.
+    Nested dicts and lists belong to the caller, so they are only copied
+    when something inside them is about to be redacted.
+    """
+    stack = [_RedactNode(event_dict, None, None, True)]
+    
+    while stack:
+        node = stack.pop()
+        container = node.container
+        
+        if isinstance(container, dict):
+            for key, value in container.items():
+                key_lower = key.lower()
+                if key_lower in _EXACT_SENSITIVE or _SENSITIVE_RE.search(key_lower) is not None:
+                    _own_container(node)
+                    node.container[key] = "[REDACTED]"
+                elif isinstance(value, (dict, list)):
+                    stack.append(_RedactNode(value, node, key, False))
+        else:
+            for index, item in enumerate(container):
+                if isinstance(item, dict):
+                    stack.append(_RedactNode(item, node, index, False))
+    
+    return event_dict
 
 
 def add_performance_metrics(logger: Any, method_name: str, event_dict: EventDict) -> EventDict:
     """Add performance metrics to logs."""
     if "processing_time_ms" in event_dict:
         # Categorize processing time
-        time_ms = event_dict["processing_time_ms"]
-        if time_ms < 100:
-            event_dict["performance_category"] = "fast"
-        elif time_ms < 1000:
-            event_dict["performance_category"] = "normal"
-        elif time_ms < 5000:
-            event_dict["performance_category"] = "slow"
-        else:
-            event_dict["performance_category"] = "very_slow"
+        index = bisect.bisect_right(_PERF_BUCKETS, event_dict["processing_time_ms"])
+        event_dict["performance_category"] = _PERF_LABELS[index]
     
     return event_dict
 
 
 def add_security_context(logger: Any, method_name: str, event_dict: EventDict) -> EventDict:
     """Add security context for security-related events."""
-    security_events = {
-        "security_advisory", "vulnerability_alert", "dependabot_alert",
-        "code_scanning_alert", "secret_scanning_alert"
-    }
-    
-    if event_dict.get("event_type") in security_events:
+    event_type = event_dict.get("github_event_type", event_dict.get("event_type"))
+    if event_type in _SECURITY_EVENTS:
         event_dict["security_event"] = True
         event_dict["alert_severity"] = event_dict.get("severity", "unknown")
     
     return event_dict
 
 
+def add_base_context(logger: Any, method_name: str, event_dict: EventDict) -> EventDict:
+    """Add level, process and application information in a single processor."""
+    add_log_level(logger, method_name, event_dict)
+    add_process_info(logger, method_name, event_dict)
+    add_app_info(logger, method_name, event_dict)
+    return event_dict
+
+
+def add_structured_context(logger: Any, method_name: str, event_dict: EventDict) -> EventDict:
+    """Apply every gitagent processor to the event dict in a single call.
+    
+    Runs add_base_context, add_github_context, filter_sensitive_data,
+    add_performance_metrics and add_security_context in order, so structlog
+    makes one processor call instead of one per step.
+    """
+    add_base_context(logger, method_name, event_dict)
+    add_github_context(logger, method_name, event_dict)
+    filter_sensitive_data(logger, method_name, event_dict)
+    add_performance_metrics(logger, method_name, event_dict)
+    add_security_context(logger, method_name, event_dict)
+    return event_dict
+
+
 def setup_logging(settings: Settings) -> None:
     """Set up structured logging configuration."""
+    level = getattr(logging, settings.log_level, logging.INFO)
     
-    # Configure structlog processors
+    # Configure structlog processors; the gitagent ones are fused into one call
     processors: list[Processor] = [
         structlog.stdlib.filter_by_level,
-        structlog.stdlib.add_logger_name,
-        add_log_level,
-        add_timestamp,
-        add_process_info,
-        add_app_info,
+        structlog.processors.TimeStamper(fmt=None, utc=True, key="timestamp"),
+        add_structured_context if settings.structured_logging else add_base_context,
     ]
     
-    # Add GitHub-specific processors if structured logging is enabled
-    if settings.structured_logging:
+    # Add final processors based on format; the console renderer is only
+    # used interactively, anything else (CI, containers, pipes) gets JSON
+    log_format = settings.log_format
+    if log_format == "console" and not sys.stdout.isatty():
+        log_format = "json"
+    
+    if log_format == "json":
         processors.extend([
-            add_github_context,
-            filter_sensitive_data,
-            add_performance_metrics,
-            add_security_context,
+            structlog.processors.JSONRenderer(serializer=_orjson_dumps)
         ])
-    
-    # Add final processors based on format
-    if settings.log_format == "json":
+    elif log_format == "logfmt":
         processors.extend([
-            structlog.processors.JSONRenderer()
+            structlog.processors.LogfmtRenderer(bool_as_flag=False)
         ])
     else:
         processors.extend([
@@ -155,7 +247,8 @@ def setup_logging(settings: Settings) -> None:
     # Configure structlog
     structlog.configure(
         processors=processors,
-        wrapper_class=structlog.stdlib.BoundLogger,
+        # Drops disabled levels at the call site, before any processor runs
+        wrapper_class=structlog.make_filtering_bound_logger(level),
         logger_factory=structlog.stdlib.LoggerFactory(),
         cache_logger_on_first_use=True,
     )
@@ -163,34 +256,74 @@ def setup_logging(settings: Settings) -> None:
     # Configure standard library logging
     logging.basicConfig(
         format="%(message)s",
-        stream=get_log_stream(settings),
-        level=getattr(logging, settings.log_level),
+        stream=sys.stdout,
+        level=level,
     )
     
-    # Set up file logging if specified
+    # File output is owned by the rotating handler alone
     if settings.log_file:
         setup_file_logging(settings)
 
 
-def get_log_stream(settings: Settings):
-    """Get the appropriate log stream."""
-    if settings.log_file:
+class FastRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """Rotating file handler that writes through a large user-space buffer.
+    
+    Records are appended to a binary buffered stream and only flushed for
+    WARNING and above, when the buffer fills, or every _LOG_FLUSH_INTERVAL
+    seconds from a background thread.
+    """
+    
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._stop_flushing = threading.Event()
+        threading.Thread(
+            target=self._flush_periodically, name="gitagent-log-flush", daemon=True
+        ).start()
+    
+    def _open(self):
+        """Open the log file as a buffered binary stream."""
+        return open(self.baseFilename, "ab", buffering=_LOG_BUFFER_SIZE)
+    
+    def _flush_periodically(self) -> None:
+        """Flush buffered records on a fixed interval until closed."""
+        while not self._stop_flushing.wait(_LOG_FLUSH_INTERVAL):
+            self.flush()
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        """Buffer a formatted record, rolling the file over when it is full."""
         try:
-            return open(settings.log_file, 'a', encoding='utf-8')
-        except Exception as e:
-            print(f"Failed to open log file {settings.log_file}: {e}", file=sys.stderr)
-            return sys.stdout
-    return sys.stdout
+            msg = (self.format(record) + self.terminator).encode(self.encoding or "utf-8")
+            if self.stream is None:
+                self.stream = self._open()
+            if self.maxBytes > 0 and self.stream.tell() + len(msg) >= self.maxBytes:
+                self.doRollover()
+            self.stream.write(msg)
+            if record.levelno >= logging.WARNING:
+                self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+    
+    def close(self) -> None:
+        """Stop the flush thread and close the file."""
+        self._stop_flushing.set()
+        super().close()
 
 
 def setup_file_logging(settings: Settings) -> None:
     """Set up file-based logging with rotation."""
+    global _queue_listener, _queue_handler, _file_handler
+    
     if not settings.log_file:
         return
     
+    # Tear down any previous setup before installing new handlers
+    stop_log_listener()
+    
     try:
         # Create rotating file handler
-        file_handler = logging.handlers.RotatingFileHandler(
+        file_handler = FastRotatingFileHandler(
             settings.log_file,
             maxBytes=10 * 1024 * 1024,  # 10MB
             backupCount=5,
@@ -198,27 +331,102 @@ def setup_file_logging(settings: Settings) -> None:
         )
         
         # Set formatter
-        if settings.log_format == "json":
-            formatter = logging.Formatter('%(message)s')
+        if settings.log_format in ("json", "logfmt"):
+            file_handler.setFormatter(_MESSAGE_FORMATTER)
         else:
-            formatter = logging.Formatter(
-                '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-            )
+            file_handler.setFormatter(_TEXT_FORMATTER)
+        
+        file_handler.setLevel(getattr(logging, settings.log_level, logging.INFO))
         
-        file_handler.setFormatter(formatter)
-        file_handler.setLevel(getattr(logging, settings.log_level))
+        # Write to disk from a background thread so callers only enqueue
+        log_queue: queue.Queue = queue.Queue(-1)
+        _file_handler = file_handler
+        _queue_listener = logging.handlers.QueueListener(
+            log_queue, file_handler, respect_handler_level=True
+        )
+        _queue_handler = logging.handlers.QueueHandler(log_queue)
         
-        # Add handler to root logger
-        root_logger = logging.getLogger()
-        root_logger.addHandler(file_handler)
+        logging.getLogger().addHandler(_queue_handler)
+        _queue_listener.start()
         
     except Exception as e:
         print(f"Failed to set up file logging: {e}", file=sys.stderr)
 
 
+def stop_log_listener() -> None:
+    """Flush pending file log records and release the file logging handlers."""
+    global _queue_listener, _queue_handler, _file_handler
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+    if _file_handler is not None:
+        # Closing flushes whatever the listener wrote into the buffer
+        _file_handler.close()
+        _file_handler = None
+
+
+atexit.register(stop_log_listener)
+
+
 def get_logger(name: str) -> structlog.BoundLogger:
     """Get a configured logger instance."""
-    return structlog.get_logger(name)
+    logger = _LOGGER_CACHE.get(name)
+    if logger is None:
+        logger = _LOGGER_CACHE[name] = structlog.get_logger(name)
+    return logger
+
+
+class RequestLogCtx:
+    """Logger for one request that carries its GitHub fields as slots.
+    
+    Unlike ``logger.bind()``, no context dict is copied; the fields are added
+    to each call's keyword arguments, skipping ones left as None.
+    """
+    
+    __slots__ = ("event_type", "delivery_id", "repository", "sender", "_log")
+    
+    def __init__(
+        self,
+        log: Any,
+        event_type: Optional[str] = None,
+        delivery_id: Optional[str] = None,
+        repository: Optional[str] = None,
+        sender: Optional[str] = None
+    ):
+        self._log = log
+        self.event_type = event_type
+        self.delivery_id = delivery_id
+        self.repository = repository
+        self.sender = sender
+    
+    def _emit(self, method: Any, event: str, kwargs: Dict[str, Any]) -> Any:
+        if self.event_type is not None:
+            kwargs.setdefault("event_type", self.event_type)
+        if self.delivery_id is not None:
+            kwargs.setdefault("delivery_id", self.delivery_id)
+        if self.repository is not None:
+            kwargs.setdefault("repository", self.repository)
+        if self.sender is not None:
+            kwargs.setdefault("sender", self.sender)
+        return method(event, **kwargs)
+    
+    def debug(self, event: str, **kwargs: Any) -> Any:
+        return self._emit(self._log.debug, event, kwargs)
+    
+    def info(self, event: str, **kwargs: Any) -> Any:
+        return self._emit(self._log.info, event, kwargs)
+    
+    def warning(self, event: str, **kwargs: Any) -> Any:
+        return self._emit(self._log.warning, event, kwargs)
+    
+    def error(self, event: str, **kwargs: Any) -> Any:
+        return self._emit(self._log.error, event, kwargs)
+    
+    def exception(self, event: str, **kwargs: Any) -> Any:
+        return self._emit(self._log.exception, event, kwargs)
 
 
 def log_event_processing_start(logger: structlog.BoundLogger, event_type: str, delivery_id: str) -> None:
@@ -392,4 +600,5 @@ def log_application_shutdown(logger: structlog.BoundLogger) -> None:
     logger.info(
         "gitagent shutting down",
         stage="shutdown"
-    ) 
\ No newline at end of file
+    )
+    stop_log_listener()
@@ -5,32 +5,70 @@ This module provides the main CLI interface for the gitagent,
 supporting direct event processing and configuration management.
 """
 
+from __future__ import annotations
+
 import os
 import sys
-import json
 import asyncio
 import argparse
+import functools
+from collections import defaultdict
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Tuple
 
+import orjson
 import structlog
 
-from .config import Settings
-from .event_handler import GitHubActionEventProcessor
-from .models import (
-    GitHubEvent, 
-    GitHubActionContext, 
-    AgentDefinition, 
-    AgentType,
-    AgentOutputConfig,
-    OutputDestination
-)
-from .logging_config import setup_logging
-from .agent_manager import agent_manager
+# Settings and the pydantic models are imported by the commands that use them,
+# so --help and argument errors never pay for pydantic
+if TYPE_CHECKING:
+    from .config import Settings
+    from .models import AgentDefinition
+
+logger = structlog.get_logger(__name__)
+
+
+def _dumps(obj: Any, pretty: bool = False) -> str:
+    """Serialize an object to JSON with orjson, optionally indented."""
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0).decode()
+
+
+def _write_stdout(data: bytes) -> None:
+    """Write a line of UTF-8 bytes to stdout, bypassing the text layer when piped."""
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is None or sys.stdout.isatty():
+        sys.stdout.write(data.decode() + "\n")
+    else:
+        # Keep ordering with anything already written through print()
+        sys.stdout.flush()
+        buffer.write(data)
+        buffer.write(b"\n")
 
 
-def setup_argument_parser() -> argparse.ArgumentParser:
-    """Set up command line argument parser."""
+def _print_json(obj: Any, pretty: bool = False) -> None:
+    """Print an object as JSON to stdout."""
+    _write_stdout(orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0))
+
+
+def _print_error(args: argparse.Namespace, message: str) -> None:
+    """Print a message to stderr unless --quiet was given."""
+    if not args.quiet:
+        print(message, file=sys.stderr)
+
+
+def _read_bytes(path: str) -> bytes:
+    """Read a whole file as bytes."""
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def setup_argument_parser(argv: Optional[List[str]] = None) -> argparse.ArgumentParser:
+    """Set up command line argument parser.
+    
+    Only the subcommand named in ``argv`` (default: ``sys.argv[1:]``) has its
+    arguments built; the others are registered by name for help and errors.
+    """
     parser = argparse.ArgumentParser(
         description="gitagent - Process GitHub Action events with commit history context",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -64,7 +102,7 @@ Examples:
     )
     parser.add_argument(
         "--log-format",
-        choices=["json", "console"],
+        choices=["json", "logfmt", "console"],
         help="Set log format (overrides environment/config)"
     )
     parser.add_argument(
@@ -83,102 +121,86 @@ Examples:
         help="Suppress non-error output"
     )
     
-    # Subcommands
+    # Subcommands; only the one being invoked gets its arguments registered
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
     
-    # Execute single agent command (new GitHub Action mode)
-    execute_agent_parser = subparsers.add_parser(
-        "execute-agent",
-        help="Execute single agent from environment variables"
-    )
-    execute_agent_parser.add_argument(
-        "--event-file",
-        type=Path,
-        help="Path to event JSON file (default: $GITHUB_EVENT_PATH)"
-    )
-    execute_agent_parser.add_argument(
-        "--output-file",
-        type=Path,
-        help="Write processing result to file"
-    )
-    execute_agent_parser.add_argument(
-        "--pretty",
-        action="store_true",
-        help="Pretty-print JSON output"
-    )
+    argv = sys.argv[1:] if argv is None else argv
+    command = _find_subcommand(argv)
     
-    # Process command (legacy mode)
-    process_parser = subparsers.add_parser(
-        "process",
-        help="Process GitHub Action events"
-    )
-    process_parser.add_argument(
+    # Register everything when the command cannot be told apart up front,
+    # so argparse still reports errors and resolves abbreviations itself
+    register_all = command not in _SUBCOMMANDS
+    
+    for name, (help_text, add_arguments) in _SUBCOMMANDS.items():
+        subparser = subparsers.add_parser(name, help=help_text)
+        if register_all or name == command:
+            add_arguments(subparser)
+    
+    return parser
+
+
+def _find_subcommand(argv: List[str]) -> Optional[str]:
+    """Return the first positional argument, skipping global options and their values.
+    
+    Abbreviated options (e.g. ``--log-l``) are matched by prefix, as argparse does.
+    """
+    args = iter(argv)
+    for arg in args:
+        if arg == "--":
+            return next(args, None)
+        if arg.startswith("--") and "=" not in arg and any(
+            option.startswith(arg) for option in _GLOBAL_OPTIONS_WITH_VALUES
+        ):
+            next(args, None)
+        elif not arg.startswith("-"):
+            return arg
+    return None
+
+
+def _add_event_file_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add arguments for the event processing commands."""
+    parser.add_argument(
         "--event-file",
-        type=Path,
         help="Path to event JSON file (default: $GITHUB_EVENT_PATH)"
     )
-    process_parser.add_argument(
+    parser.add_argument(
         "--output-file",
         type=Path,
         help="Write processing result to file"
     )
-    process_parser.add_argument(
+    parser.add_argument(
         "--pretty",
         action="store_true",
         help="Pretty-print JSON output"
     )
-    
-    # List events command
-    list_events_parser = subparsers.add_parser(
-        "list-events",
-        help="List supported event types"
-    )
-    list_events_parser.add_argument(
-        "--category",
-        help="Filter by event category"
-    )
-    list_events_parser.add_argument(
-        "--format",
-        choices=["table", "json"],
-        default="table",
-        help="Output format"
-    )
-    
-    # Configuration commands
-    config_parser = subparsers.add_parser(
-        "config",
-        help="Show current configuration"
-    )
-    config_parser.add_argument(
-        "--format",
-        choices=["table", "json"],
-        default="table",
-        help="Output format"
-    )
-    
-    validate_config_parser = subparsers.add_parser(
-        "validate-config",
-        help="Validate configuration"
-    )
-    
-    # Statistics command
-    stats_parser = subparsers.add_parser(
-        "stats",
-        help="Show processing statistics"
-    )
-    stats_parser.add_argument(
+
+
+def _add_format_argument(parser: argparse.ArgumentParser) -> None:
+    """Add the --format argument shared by the reporting commands."""
+    parser.add_argument(
         "--format",
         choices=["table", "json"],
         default="table",
         help="Output format"
     )
-    
-    # Agent commands
-    agents_parser = subparsers.add_parser(
-        "agents",
-        help="Agent management commands"
+
+
+def _add_list_events_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add arguments for the list-events command."""
+    parser.add_argument(
+        "--category",
+        help="Filter by event category"
     )
-    agents_subparsers = agents_parser.add_subparsers(dest="agent_command", help="Agent subcommands")
+    _add_format_argument(parser)
+
+
+def _add_no_arguments(parser: argparse.ArgumentParser) -> None:
+    """Commands without arguments of their own."""
+
+
+def _add_agents_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the agent management subcommands."""
+    agents_subparsers = parser.add_subparsers(dest="agent_command", help="Agent subcommands")
     
     # List agents command
     list_agents_parser = agents_subparsers.add_parser(
@@ -189,12 +211,7 @@ Examples:
         "--event-type",
         help="Filter agents by event type"
     )
-    list_agents_parser.add_argument(
-        "--format",
-        choices=["table", "json"],
-        default="table",
-        help="Output format"
-    )
+    _add_format_argument(list_agents_parser)
     
     # Test agent command
     test_agent_parser = agents_subparsers.add_parser(
@@ -217,12 +234,7 @@ Examples:
         "stats",
         help="Show agent statistics"
     )
-    agent_stats_parser.add_argument(
-        "--format",
-        choices=["table", "json"],
-        default="table",
-        help="Output format"
-    )
+    _add_format_argument(agent_stats_parser)
     
     # Validate agents command
     validate_agents_parser = agents_subparsers.add_parser(
@@ -234,99 +246,147 @@ Examples:
         type=Path,
         help="Directory to validate (default: agents directory from config)"
     )
-    
-    return parser
+
+
+# Global options that consume the following argument
+_GLOBAL_OPTIONS_WITH_VALUES = frozenset({"--log-level", "--log-format", "--config-file"})
+
+# Subcommand name -> (help text, function adding its arguments)
+_SUBCOMMANDS = {
+    "execute-agent": ("Execute single agent from environment variables", _add_event_file_arguments),
+    "process": ("Process GitHub Action events", _add_event_file_arguments),
+    "list-events": ("List supported event types", _add_list_events_arguments),
+    "config": ("Show current configuration", _add_format_argument),
+    "validate-config": ("Validate configuration", _add_no_arguments),
+    "stats": ("Show processing statistics", _add_format_argument),
+    "agents": ("Agent management commands", _add_agents_arguments),
+}
+
+
+def _env_int(value: str) -> int:
+    """Parse an integer environment value, falling back to 0."""
+    try:
+        return int(value)
+    except ValueError:
+        return 0
+
+
+def _env_bool(value: str) -> bool:
+    """Parse a boolean environment value."""
+    return value.lower() in ('true', '1', 'yes', 'on')
+
+
+def _env_list(value: str) -> list:
+    """Parse a comma-separated environment value."""
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+# Environment variable -> (agent configuration key, converter) for set variables
+_AGENT_CONFIGURATION_ENV = (
+    # Basic configuration
+    ("MODEL", "model", None),
+    ("TIMEOUT_SECONDS", "timeout_seconds", _env_int),
+    # Claude Code SDK specific configuration
+    ("MAX_TURNS", "max_turns", _env_int),
+    ("SYSTEM_PROMPT", "system_prompt", None),
+    ("APPEND_SYSTEM_PROMPT", "append_system_prompt", None),
+    ("OUTPUT_FORMAT", "output_format", None),
+    ("PERMISSION_MODE", "permission_mode", None),
+    ("ALLOWED_TOOLS", "allowed_tools", _env_list),
+    ("DISALLOWED_TOOLS", "disallowed_tools", _env_list),
+    ("USE_BEDROCK", "use_bedrock", _env_bool),
+    ("USE_VERTEX", "use_vertex", _env_bool),
+)
+
+
+# Agent result metadata key -> GitHub Actions output name, written when set
+_METADATA_OUTPUTS = (
+    ("tokens_used", "tokens-used"),
+    ("cost_usd", "cost-usd"),
+    ("session_id", "session-id"),
+    ("turns_used", "turns-used"),
+)
+
+
+# Pre-rendered GitHub Actions "success" output lines
+_SUCCESS_LINES = {True: "success=true\n", False: "success=false\n"}
+
+
+# Every environment variable read when building the agent definition
+_AGENT_ENV_KEYS = (
+    "AGENT_TYPE", "AGENT_NAME", "AGENT_DESCRIPTION", "AGENT_VERSION", "EXECUTABLE",
+    *(env_key for env_key, _, _ in _AGENT_CONFIGURATION_ENV),
+    "OUTPUT_FORMAT_TYPE", "MAX_OUTPUT_LENGTH", "OUTPUT_FILE",
+    "PROMPT_TEMPLATE", "PROMPT_TEMPLATE_FILE",
+)
 
 
 def create_agent_definition_from_env() -> AgentDefinition:
-    """Create agent definition from environment variables."""
-    logger = structlog.get_logger(__name__)
+    """Create agent definition from environment variables.
     
-    def get_env_bool(key: str, default: bool = False) -> bool:
-        """Get boolean value from environment variable."""
-        value = os.getenv(key, str(default)).lower()
-        return value in ('true', '1', 'yes', 'on')
+    Definitions are memoized on the relevant environment values and the
+    prompt template file's mtime, so the result must not be mutated.
+    """
+    env_values = tuple(os.environ.get(key) for key in _AGENT_ENV_KEYS)
     
-    def get_env_int(key: str, default: int = 0) -> int:
-        """Get integer value from environment variable."""
+    template_mtime = None
+    prompt_template_file = os.environ.get("PROMPT_TEMPLATE_FILE")
+    if prompt_template_file:
         try:
-            return int(os.getenv(key, str(default)))
-        except ValueError:
-            return default
+            template_mtime = os.stat(prompt_template_file).st_mtime_ns
+        except OSError:
+            pass
     
-    def get_env_float(key: str, default: float = 0.0) -> float:
-        """Get float value from environment variable."""
-        try:
-            return float(os.getenv(key, str(default)))
-        except ValueError:
-            return default
+    return _build_agent_definition(env_values, template_mtime)
+
+
+@functools.lru_cache(maxsize=8)
+def _build_agent_definition(
+    env_values: Tuple[Optional[str], ...],
+    template_mtime: Optional[int]
+) -> AgentDefinition:
+    """Build an agent definition from a snapshot of the agent environment variables."""
+    from .models import AgentDefinition, AgentOutputConfig, OutputDestination
     
-    def get_env_list(key: str, default: Optional[list] = None) -> list:
-        """Get list value from environment variable (comma-separated)."""
-        value = os.getenv(key, "")
-        if not value:
-            return default or []
-        return [item.strip() for item in value.split(',') if item.strip()]
+    env = {key: value for key, value in zip(_AGENT_ENV_KEYS, env_values) if value is not None}
     
     # Agent definition
     agent_dict = {
-        "type": os.getenv("AGENT_TYPE", "custom"),
-        "name": os.getenv("AGENT_NAME", "ai-agent"),
-        "description": os.getenv("AGENT_DESCRIPTION", "AI agent execution"),
-        "version": os.getenv("AGENT_VERSION", "1.0.0"),
+        "type": env.get("AGENT_TYPE", "custom"),
+        "name": env.get("AGENT_NAME", "ai-agent"),
+        "description": env.get("AGENT_DESCRIPTION", "AI agent execution"),
+        "version": env.get("AGENT_VERSION", "1.0.0"),
     }
     
     # Add executable if specified
-    if os.getenv("EXECUTABLE"):
-        agent_dict["executable"] = os.getenv("EXECUTABLE")
+    executable = env.get("EXECUTABLE")
+    if executable:
+        agent_dict["executable"] = executable
     
     # Agent configuration
     configuration = {}
-    
-    # Basic configuration
-    if os.getenv("MODEL"):
-        configuration["model"] = os.getenv("MODEL")
-    if os.getenv("TIMEOUT_SECONDS"):
-        configuration["timeout_seconds"] = get_env_int("TIMEOUT_SECONDS")
-    
-    # Claude Code SDK specific configuration
-    if os.getenv("MAX_TURNS"):
-        configuration["max_turns"] = get_env_int("MAX_TURNS")
-    if os.getenv("SYSTEM_PROMPT"):
-        configuration["system_prompt"] = os.getenv("SYSTEM_PROMPT")
-    if os.getenv("APPEND_SYSTEM_PROMPT"):
-        configuration["append_system_prompt"] = os.getenv("APPEND_SYSTEM_PROMPT")
-    if os.getenv("OUTPUT_FORMAT"):
-        configuration["output_format"] = os.getenv("OUTPUT_FORMAT")
-    if os.getenv("PERMISSION_MODE"):
-        configuration["permission_mode"] = os.getenv("PERMISSION_MODE")
-    if os.getenv("ALLOWED_TOOLS"):
-        configuration["allowed_tools"] = get_env_list("ALLOWED_TOOLS")
-    if os.getenv("DISALLOWED_TOOLS"):
-        configuration["disallowed_tools"] = get_env_list("DISALLOWED_TOOLS")
-    if os.getenv("USE_BEDROCK"):
-        configuration["use_bedrock"] = get_env_bool("USE_BEDROCK")
-    if os.getenv("USE_VERTEX"):
-        configuration["use_vertex"] = get_env_bool("USE_VERTEX")
-    
+    for env_key, config_key, convert in _AGENT_CONFIGURATION_ENV:
+        value = env.get(env_key)
+        if value:
+            configuration[config_key] = convert(value) if convert else value
     
     # Output configuration
+    max_output_length = env.get("MAX_OUTPUT_LENGTH")
     output_config = AgentOutputConfig(
         destination=OutputDestination.CONSOLE,  # Default, can be overridden
-        format=os.getenv("OUTPUT_FORMAT_TYPE", "text"),
-        max_length=get_env_int("MAX_OUTPUT_LENGTH") if os.getenv("MAX_OUTPUT_LENGTH") else None,
-        output_file=os.getenv("OUTPUT_FILE")
+        format=env.get("OUTPUT_FORMAT_TYPE", "text"),
+        max_length=_env_int(max_output_length) if max_output_length else None,
+        output_file=env.get("OUTPUT_FILE")
     )
     
     # Prompt template - support both direct template and file path
-    prompt_template = os.getenv("PROMPT_TEMPLATE")
-    prompt_template_file = os.getenv("PROMPT_TEMPLATE_FILE")
+    prompt_template = env.get("PROMPT_TEMPLATE")
+    prompt_template_file = env.get("PROMPT_TEMPLATE_FILE")
     
     if prompt_template_file:
         # Read prompt template from file
         try:
-            with open(prompt_template_file, 'r', encoding='utf-8') as f:
-                prompt_template = f.read()
+            prompt_template = Path(prompt_template_file).read_text(encoding='utf-8')
         except FileNotFoundError:
             logger.error(f"Prompt template file not found: {prompt_template_file}")
             raise ValueError(f"Prompt template file not found: {prompt_template_file}")
@@ -347,79 +407,89 @@ def create_agent_definition_from_env() -> AgentDefinition:
     )
 
 
+def _append_github_outputs(path: str, text: str) -> None:
+    """Append pre-rendered ``name=value`` lines to the GitHub Actions output file."""
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(text)
+
+
+def _write_failure_outputs(path: Optional[str], error: Exception) -> None:
+    """Record a failed run in the GitHub Actions output file, if there is one."""
+    if path:
+        # Outputs are one name=value per line, so multi-line messages are flattened
+        message = " ".join(str(error).split())
+        try:
+            _append_github_outputs(path, f"success=false\nerror={message}\nexecution-time=0\n")
+        except Exception:
+            pass
+
+
 async def execute_single_agent(args: argparse.Namespace, settings: Settings) -> int:
     """Execute a single agent from environment variables."""
-    logger = structlog.get_logger(__name__)
+    github_outputs_path = os.environ.get("GITHUB_OUTPUT")
     
     try:
+        from pydantic import ValidationError
+        from .models import GitHubEvent, GitHubActionContext
+        
         # Create agent definition from environment variables
         agent_definition = create_agent_definition_from_env()
+        log = logger.bind(agent_name=agent_definition.agent.get("name", "unknown"))
         
         # Determine event file path
         event_file = args.event_file
         if not event_file:
             event_file = os.getenv('GITHUB_EVENT_PATH')
             if not event_file:
-                if not args.quiet:
-                    print("Error: No event file specified and GITHUB_EVENT_PATH not set", file=sys.stderr)
+                _print_error(args, "Error: No event file specified and GITHUB_EVENT_PATH not set")
                 return 1
         
-        event_file = Path(event_file)
-        
-        # Load event data if file exists
-        event_data = {}
-        if event_file.exists():
+        # Parse the GitHub event straight from the file bytes if it exists
+        if os.path.isfile(event_file):
             try:
-                with open(event_file, 'r', encoding='utf-8') as f:
-                    event_data = json.load(f)
-            except json.JSONDecodeError as e:
-                if not args.quiet:
-                    print(f"Error: Invalid JSON in event file: {e}", file=sys.stderr)
+                github_event = GitHubEvent.model_validate_json(
+                    await asyncio.to_thread(_read_bytes, event_file)
+                )
+            except ValidationError as e:
+                _write_failure_outputs(github_outputs_path, e)
+                _print_error(args, f"Error: Invalid event file: {e}")
                 return 1
             except Exception as e:
-                if not args.quiet:
-                    print(f"Error: Failed to read event file: {e}", file=sys.stderr)
+                _print_error(args, f"Error: Failed to read event file: {e}")
                 return 1
-        
-        # Create GitHub event object
-        github_event = GitHubEvent(**event_data)
+        else:
+            github_event = GitHubEvent()
         
         # Get GitHub Action context
-        github_context = GitHubActionContext(
-            event_name=os.getenv("GITHUB_EVENT_NAME", "unknown"),
-            workflow=os.getenv("GITHUB_WORKFLOW", "unknown"),
-            job=os.getenv("GITHUB_JOB", "unknown"),
-            run_id=os.getenv("GITHUB_RUN_ID", "0"),
-            run_number=int(os.getenv("GITHUB_RUN_NUMBER", "0")),
-            actor=os.getenv("GITHUB_ACTOR", "unknown"),
-            repository=os.getenv("GITHUB_REPOSITORY", "unknown"),
-            ref=os.getenv("GITHUB_REF", "refs/heads/main"),
-            sha=os.getenv("GITHUB_SHA", "unknown"),
-            workspace=os.getenv("WORKSPACE_PATH") or os.getenv("GITHUB_WORKSPACE", os.getcwd()),
-            server_url=os.getenv("GITHUB_SERVER_URL", "https://github.com"),
-            api_url=os.getenv("GITHUB_API_URL", "https://api.github.com"),
-            graphql_url=os.getenv("GITHUB_GRAPHQL_URL", "https://api.github.com/graphql")
-        )
+        github_context = GitHubActionContext.from_env(workspace=os.environ.get("WORKSPACE_PATH"))
         
         # Get commit history
+        from .agent_manager import agent_manager
         from .event_handler import BaseEventHandler
         base_handler = BaseEventHandler(settings)
-        commit_history = await base_handler._get_commit_history(
-            github_context, 
-            settings.commit_history_count
+        
+        # Fetch commit history while the agent manager prepares for the run
+        commit_history, _ = await asyncio.gather(
+            base_handler._get_commit_history(github_context, settings.commit_history_count),
+            agent_manager.ensure_ready(settings.github_token, agent_definition)
         )
         
         # Execute the agent
-        agent_manager_instance = agent_manager
-        agent_manager_instance._github_token = settings.github_token
-        
-        result = await agent_manager_instance.execute_agent(
+        result = await agent_manager.execute_agent(
             agent_definition,
             github_event,
             github_context,
             commit_history
         )
         
+        # Serialize the models once for both the output data and GitHub outputs
+        commit_history_dict = commit_history.dict() if commit_history else None
+        files_changed_dicts = [fc.dict() for fc in (result.files_changed or [])]
+        github_context_dict = github_context.dict()
+        
+        agent_type_value = result.agent_type.value
+        metadata = result.metadata or {}
+        
         # Prepare output data
         output_data = {
             "success": result.success,
@@ -427,65 +497,59 @@ async def execute_single_agent(args: argparse.Namespace, settings: Settings) ->
             "error": result.error or "",
             "execution_time": result.execution_time,
             "agent_name": result.agent_name,
-            "agent_type": result.agent_type.value,
-            "commit_history": commit_history.dict() if commit_history else None,
-            "files_changed": [fc.dict() for fc in (result.files_changed or [])],
-            "github_context": github_context.dict(),
+            "agent_type": agent_type_value,
+            "commit_history": commit_history_dict,
+            "files_changed": files_changed_dicts,
+            "github_context": github_context_dict,
             "model_used": agent_definition.configuration.get("model"),
-            "tokens_used": result.metadata.get("tokens_used") if result.metadata else None,
-            "cost_usd": result.metadata.get("cost_usd") if result.metadata else None,
-            "session_id": result.metadata.get("session_id") if result.metadata else None,
-            "turns_used": result.metadata.get("turns_used") if result.metadata else None,
+            "tokens_used": metadata.get("tokens_used"),
+            "cost_usd": metadata.get("cost_usd"),
+            "session_id": metadata.get("session_id"),
+            "turns_used": metadata.get("turns_used"),
             "output_file_path": agent_definition.output.output_file if agent_definition.output.output_file else None
         }
         
         # Set GitHub Actions outputs
-        github_outputs_path = os.getenv("GITHUB_OUTPUT")
         if github_outputs_path:
             try:
-                with open(github_outputs_path, 'a', encoding='utf-8') as f:
-                    f.write(f"success={str(result.success).lower()}\n")
-                    f.write(f"output={result.output or ''}\n")
-                    f.write(f"error={result.error or ''}\n")
-                    f.write(f"execution-time={result.execution_time}\n")
-                    f.write(f"agent-name={result.agent_name}\n")
-                    f.write(f"agent-type={result.agent_type.value}\n")
-                    f.write(f"commit-history={json.dumps(commit_history.dict()) if commit_history else '{}'}\n")
-                    f.write(f"files-changed={json.dumps([fc.dict() for fc in (result.files_changed or [])])}\n")
-                    f.write(f"github-context={json.dumps(github_context.dict())}\n")
-                    
-                    # Optional metadata outputs
-                    if agent_definition.configuration.get("model"):
-                        f.write(f"model-used={agent_definition.configuration['model']}\n")
-                    if result.metadata and result.metadata.get("tokens_used"):
-                        f.write(f"tokens-used={result.metadata['tokens_used']}\n")
-                    if result.metadata and result.metadata.get("cost_usd"):
-                        f.write(f"cost-usd={result.metadata['cost_usd']}\n")
-                    if result.metadata and result.metadata.get("session_id"):
-                        f.write(f"session-id={result.metadata['session_id']}\n")
-                    if result.metadata and result.metadata.get("turns_used"):
-                        f.write(f"turns-used={result.metadata['turns_used']}\n")
-                    if agent_definition.output.output_file:
-                        f.write(f"output-file-path={agent_definition.output.output_file}\n")
+                lines = [
+                    _SUCCESS_LINES[result.success],
+                    f"output={result.output or ''}\n",
+                    f"error={result.error or ''}\n",
+                    f"execution-time={result.execution_time}\n",
+                    f"agent-name={result.agent_name}\n",
+                    f"agent-type={agent_type_value}\n",
+                    f"commit-history={_dumps(commit_history_dict) if commit_history_dict else '{}'}\n",
+                    f"files-changed={_dumps(files_changed_dicts)}\n",
+                    f"github-context={_dumps(github_context_dict)}\n",
+                ]
+                
+                # Optional metadata outputs
+                if agent_definition.configuration.get("model"):
+                    lines.append(f"model-used={agent_definition.configuration['model']}\n")
+                for key, output_name in _METADATA_OUTPUTS:
+                    if metadata.get(key):
+                        lines.append(f"{output_name}={metadata[key]}\n")
+                if agent_definition.output.output_file:
+                    lines.append(f"output-file-path={agent_definition.output.output_file}\n")
+                
+                _append_github_outputs(github_outputs_path, "".join(lines))
             except Exception as e:
-                logger.warning("Failed to write GitHub Actions outputs", error=str(e))
+                log.warning("Failed to write GitHub Actions outputs", error=str(e))
         
         # Write to output file if specified
         if args.output_file:
             try:
-                with open(args.output_file, 'w', encoding='utf-8') as f:
-                    json.dump(output_data, f, indent=2 if args.pretty else None)
-                logger.info("Output written to file", file=args.output_file)
+                with open(args.output_file, 'wb') as f:
+                    f.write(orjson.dumps(output_data, option=orjson.OPT_INDENT_2 if args.pretty else 0))
+                log.info("Output written to file", file=args.output_file)
             except Exception as e:
-                logger.error("Failed to write output file", error=str(e))
+                log.error("Failed to write output file", error=str(e))
                 return 1
         
         # Print output if not quiet
         if not args.quiet:
-            if args.pretty:
-                print(json.dumps(output_data, indent=2))
-            else:
-                print(json.dumps(output_data))
+            _print_json(output_data, pretty=args.pretty)
         
         # Return appropriate exit code
         return 0 if result.success else 1
@@ -494,124 +558,103 @@ async def execute_single_agent(args: argparse.Namespace, settings: Settings) ->
         logger.error("Single agent execution failed", error=str(e))
         
         # Set GitHub Actions outputs for failure
-        github_outputs_path = os.getenv("GITHUB_OUTPUT")
-        if github_outputs_path:
-            try:
-                with open(github_outputs_path, 'a', encoding='utf-8') as f:
-                    f.write("success=false\n")
-                    f.write(f"error={str(e)}\n")
-                    f.write("execution-time=0\n")
-            except Exception:
-                pass
+        _write_failure_outputs(github_outputs_path, e)
         
-        if not args.quiet:
-            print(f"Error: {e}", file=sys.stderr)
+        _print_error(args, f"Error: {e}")
         return 1
 
 
+# Event processor reused by commands running with the same settings object
+_event_processor = None
+
+
+def _get_event_processor(settings: Settings):
+    """Return the GitHubActionEventProcessor for ``settings``, building it once."""
+    global _event_processor
+    if _event_processor is None or _event_processor.settings is not settings:
+        from .event_handler import GitHubActionEventProcessor
+        _event_processor = GitHubActionEventProcessor(settings)
+    return _event_processor
+
+
+# Fields of EventProcessingResult written by the process command
+_PROCESS_OUTPUT_FIELDS = {
+    "success": True,
+    "event_type": True,
+    "processing_time": True,
+    "message": True,
+    "error": True,
+    "commit_history": {
+        "branch": True,
+        "total_commits": True,
+        "head_sha": True,
+        "commits": {"__all__": {"sha", "message", "author_name", "author_email", "timestamp"}},
+    },
+    "github_context": {"event_name", "workflow", "job", "repository", "actor", "ref", "sha"},
+    "metadata": True,
+}
+
+
 async def process_github_event(args: argparse.Namespace, settings: Settings) -> int:
     """Process a GitHub Action event."""
-    logger = structlog.get_logger(__name__)
     
     try:
+        from pydantic import ValidationError
+        from .models import GitHubEvent
+        
         # Determine event file path
         event_file = args.event_file
         if not event_file:
             event_file = os.getenv('GITHUB_EVENT_PATH')
             if not event_file:
-                if not args.quiet:
-                    print("Error: No event file specified and GITHUB_EVENT_PATH not set", file=sys.stderr)
+                _print_error(args, "Error: No event file specified and GITHUB_EVENT_PATH not set")
                 return 1
         
-        event_file = Path(event_file)
-        if not event_file.exists():
-            if not args.quiet:
-                print(f"Error: Event file not found: {event_file}", file=sys.stderr)
+        if not os.path.isfile(event_file):
+            _print_error(args, f"Error: Event file not found: {event_file}")
             return 1
         
-        # Load event data
+        # Parse the GitHub event straight from the file bytes
         try:
-            with open(event_file, 'r', encoding='utf-8') as f:
-                event_data = json.load(f)
-        except json.JSONDecodeError as e:
-            if not args.quiet:
-                print(f"Error: Invalid JSON in event file: {e}", file=sys.stderr)
+            github_event = GitHubEvent.model_validate_json(
+                await asyncio.to_thread(_read_bytes, event_file)
+            )
+        except ValidationError as e:
+            _print_error(args, f"Error: Invalid event file: {e}")
             return 1
         except Exception as e:
-            if not args.quiet:
-                print(f"Error: Failed to read event file: {e}", file=sys.stderr)
+            _print_error(args, f"Error: Failed to read event file: {e}")
             return 1
         
-        # Create event processor
-        processor = GitHubActionEventProcessor(settings)
-        
-        # Create GitHub event object
-        github_event = GitHubEvent(**event_data)
+        # Get the event processor
+        processor = _get_event_processor(settings)
         
         # Process the event
         result = await processor.process_event(github_event)
         
-        # Prepare output
-        output_data = {
-            "success": result.success,
-            "event_type": result.event_type,
-            "processing_time": result.processing_time,
-            "message": result.message
+        # Serialize the result directly with pydantic, leaving out empty sections
+        exclude = {
+            name for name in ("error", "commit_history", "github_context", "metadata")
+            if not getattr(result, name)
         }
-        
-        if result.error:
-            output_data["error"] = result.error
-        
-        if result.commit_history:
-            output_data["commit_history"] = {
-                "branch": result.commit_history.branch,
-                "total_commits": result.commit_history.total_commits,
-                "head_sha": result.commit_history.head_sha,
-                "commits": [
-                    {
-                        "sha": commit.sha,
-                        "message": commit.message,
-                        "author_name": commit.author_name,
-                        "author_email": commit.author_email,
-                        "timestamp": commit.timestamp.isoformat()
-                    }
-                    for commit in result.commit_history.commits
-                ]
-            }
-        
-        if result.github_context:
-            output_data["github_context"] = {
-                "event_name": result.github_context.event_name,
-                "workflow": result.github_context.workflow,
-                "job": result.github_context.job,
-                "repository": result.github_context.repository,
-                "actor": result.github_context.actor,
-                "ref": result.github_context.ref,
-                "sha": result.github_context.sha
-            }
-        
-        if result.metadata:
-            output_data["metadata"] = result.metadata
-        
-        # Format output
-        if args.pretty:
-            output_str = json.dumps(output_data, indent=2, ensure_ascii=False)
-        else:
-            output_str = json.dumps(output_data, ensure_ascii=False)
+        output = result.model_dump_json(
+            include=_PROCESS_OUTPUT_FIELDS,
+            exclude=exclude,
+            indent=2 if args.pretty else None
+        ).encode()
         
         # Write output
         if args.output_file:
             try:
-                with open(args.output_file, 'w', encoding='utf-8') as f:
-                    f.write(output_str)
+                with open(args.output_file, 'wb') as f:
+                    f.write(output)
                 if not args.quiet:
                     print(f"Result written to: {args.output_file}")
             except Exception as e:
-                if not args.quiet:
-                    print(f"Error: Failed to write output file: {e}", file=sys.stderr)
+                _print_error(args, f"Error: Failed to write output file: {e}")
                 return 1
         else:
-            print(output_str)
+            _write_stdout(output)
         
         # Log result
         if result.success:
@@ -632,15 +675,14 @@ async def process_github_event(args: argparse.Namespace, settings: Settings) ->
         
     except Exception as e:
         logger.error("Unexpected error during event processing", error=str(e))
-        if not args.quiet:
-            print(f"Error: {e}", file=sys.stderr)
+        _print_error(args, f"Error: {e}")
         return 1
 
 
 def list_supported_events(args: argparse.Namespace, settings: Settings) -> int:
     """List supported event types."""
     try:
-        processor = GitHubActionEventProcessor(settings)
+        processor = _get_event_processor(settings)
         events = processor.get_supported_events()
         
         # Filter by category if specified
@@ -653,28 +695,24 @@ def list_supported_events(args: argparse.Namespace, settings: Settings) -> int:
                 "total_count": len(events),
                 "categories": list(set(e.get("category", "") for e in events))
             }
-            print(json.dumps(output, indent=2))
+            _print_json(output, pretty=True)
         else:
-            # Table format
-            print(f"Supported Events ({len(events)} total)")
-            print("=" * 80)
+            # Table format, built up and written in one call
+            lines = [f"Supported Events ({len(events)} total)", "=" * 80]
             
             # Group by category
-            categories = {}
+            categories: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
             for event in events:
-                category = event.get("category", "other")
-                if category not in categories:
-                    categories[category] = []
-                categories[category].append(event)
+                categories[event.get("category", "other")].append(event)
             
-            for category, category_events in sorted(categories.items()):
-                print(f"\n{category.upper()}")
-                print("-" * len(category))
+            for category in sorted(categories):
+                lines.append(f"\n{category.upper()}")
+                lines.append("-" * len(category))
                 
-                for event in sorted(category_events, key=lambda x: x.get("name", "")):
-                    name = event.get("name", "")
-                    handler = event.get("handler", "")
-                    print(f"  {name:<30} {handler}")
+                for event in sorted(categories[category], key=itemgetter("name")):
+                    lines.append(f"  {event['name']:<30} {event.get('handler', '')}")
+            
+            sys.stdout.write("\n".join(lines) + "\n")
         
         return 0
         
@@ -689,7 +727,7 @@ def show_configuration(args: argparse.Namespace, settings: Settings) -> int:
         config_data = settings.get_summary()
         
         if args.format == "json":
-            print(json.dumps(config_data, indent=2))
+            _print_json(config_data, pretty=True)
         else:
             # Table format
             print("gitagent Configuration")
@@ -718,17 +756,15 @@ def validate_configuration(args: argparse.Namespace, settings: Settings) -> int:
         
         # Check event file path
         if settings.github_event_path:
-            event_path = Path(settings.github_event_path)
-            if not event_path.exists():
-                issues.append(f"GitHub event file not found: {event_path}")
+            if not os.path.exists(settings.github_event_path):
+                issues.append(f"GitHub event file not found: {settings.github_event_path}")
         else:
             issues.append("GITHUB_EVENT_PATH not set")
         
         # Check workspace
         if settings.github_workspace:
-            workspace_path = Path(settings.github_workspace)
-            if not workspace_path.exists():
-                issues.append(f"GitHub workspace not found: {workspace_path}")
+            if not os.path.exists(settings.github_workspace):
+                issues.append(f"GitHub workspace not found: {settings.github_workspace}")
         
         # Check git commit history count
         if not (1 <= settings.commit_history_count <= 100):
@@ -761,11 +797,11 @@ def validate_configuration(args: argparse.Namespace, settings: Settings) -> int:
 def show_statistics(args: argparse.Namespace, settings: Settings) -> int:
     """Show processing statistics."""
     try:
-        processor = GitHubActionEventProcessor(settings)
+        processor = _get_event_processor(settings)
         stats = processor.get_statistics()
         
         if args.format == "json":
-            print(json.dumps(stats, indent=2))
+            _print_json(stats, pretty=True)
         else:
             # Table format
             print("Processing Statistics")
@@ -793,73 +829,74 @@ def show_statistics(args: argparse.Namespace, settings: Settings) -> int:
 async def list_agents(args: argparse.Namespace, settings: Settings) -> int:
     """List discovered agents."""
     try:
+        from .agent_manager import agent_manager
+        
         # Determine event types to check
         event_types = []
         if args.event_type:
             event_types = [args.event_type]
         else:
             # Get all supported event types
-            from .models import GitHubActionTrigger
-            event_types = [trigger.value for trigger in GitHubActionTrigger]
+            from .models import ALL_TRIGGER_VALUES
+            event_types = list(ALL_TRIGGER_VALUES)
         
-        all_agents = []
-        for event_type in event_types:
-            agents = await agent_manager.discover_agents(event_type, settings.github_workspace)
+        agents_by_type = await agent_manager.discover_all_agents(event_types, settings.github_workspace)
+        
+        # Keep the first occurrence of each agent file across event types
+        unique_by_path: Dict[str, Dict[str, Any]] = {}
+        agent_types_seen = set()
+        for event_type, agents in agents_by_type.items():
             for agent in agents:
-                agent_info = {
+                file_path = agent.agent.get("file_path", "unknown")
+                if file_path in unique_by_path:
+                    continue
+                agent_type = agent.agent.get("type", "custom")
+                agent_types_seen.add(agent_type)
+                unique_by_path[file_path] = {
                     "name": agent.agent.get("name", "unknown"),
-                    "type": agent.agent.get("type", "custom"),
+                    "type": agent_type,
                     "event_type": event_type,
-                    "file_path": agent.agent.get("file_path", "unknown"),
+                    "file_path": file_path,
                     "priority": agent.priority,
                     "enabled": agent.enabled,
                     "description": agent.agent.get("description", "")
                 }
-                all_agents.append(agent_info)
-        
-        # Remove duplicates based on file path
-        seen_paths = set()
-        unique_agents = []
-        for agent in all_agents:
-            if agent["file_path"] not in seen_paths:
-                unique_agents.append(agent)
-                seen_paths.add(agent["file_path"])
+        unique_agents = list(unique_by_path.values())
         
         if args.format == "json":
             output = {
                 "agents": unique_agents,
                 "total_count": len(unique_agents),
-                "agent_types": list(set(a["type"] for a in unique_agents)),
-                "event_types": list(set(a["event_type"] for a in all_agents))
+                "agent_types": list(agent_types_seen),
+                "event_types": [event_type for event_type, agents in agents_by_type.items() if agents]
             }
-            print(json.dumps(output, indent=2))
+            _print_json(output, pretty=True)
         else:
-            # Table format
-            print(f"Discovered Agents ({len(unique_agents)} total)")
-            print("=" * 80)
+            # Table format, built up and written in one call
+            lines = [f"Discovered Agents ({len(unique_agents)} total)", "=" * 80]
             
             if not unique_agents:
-                print("No agents found.")
-                print(f"Agents directory: {settings.agents_directory}")
+                lines.append("No agents found.")
+                lines.append(f"Agents directory: {settings.agents_directory}")
+                sys.stdout.write("\n".join(lines) + "\n")
                 return 0
             
             # Group by type
-            agent_types = {}
+            agent_types: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
             for agent in unique_agents:
-                agent_type = agent["type"]
-                if agent_type not in agent_types:
-                    agent_types[agent_type] = []
-                agent_types[agent_type].append(agent)
+                agent_types[agent["type"]].append(agent)
             
             for agent_type, type_agents in sorted(agent_types.items()):
-                print(f"\n{agent_type.upper()} AGENTS")
-                print("-" * (len(agent_type) + 7))
+                lines.append(f"\n{agent_type.upper()} AGENTS")
+                lines.append("-" * (len(agent_type) + 7))
                 
-                for agent in sorted(type_agents, key=lambda x: x["name"]):
+                for agent in sorted(type_agents, key=itemgetter("name")):
                     status = "✓" if agent["enabled"] else "✗"
-                    print(f"  {status} {agent['name']:<25} (Priority: {agent['priority']})")
+                    lines.append(f"  {status} {agent['name']:<25} (Priority: {agent['priority']})")
                     if agent["description"]:
-                        print(f"    {agent['description']}")
+                        lines.append(f"    {agent['description']}")
+            
+            sys.stdout.write("\n".join(lines) + "\n")
         
         return 0
         
@@ -871,15 +908,15 @@ async def list_agents(args: argparse.Namespace, settings: Settings) -> int:
 async def test_agent(args: argparse.Namespace, settings: Settings) -> int:
     """Test agent configuration."""
     try:
-        import yaml
+        from .agent_manager import agent_manager
+        from .models import AgentDefinition, GitHubEvent, GitHubActionContext
         
         # Load agent configuration
-        if not args.agent_file.exists():
+        if not os.path.exists(args.agent_file):
             print(f"Agent file not found: {args.agent_file}", file=sys.stderr)
             return 1
         
-        with open(args.agent_file, 'r', encoding='utf-8') as f:
-            agent_data = yaml.safe_load(f)
+        agent_data = await asyncio.to_thread(_load_yaml_file, args.agent_file)
         
         # Add file metadata
         if "agent" not in agent_data:
@@ -889,7 +926,7 @@ async def test_agent(args: argparse.Namespace, settings: Settings) -> int:
         
         # Create agent definition
         try:
-            agent_def = AgentDefinition(**agent_data)
+            agent_def = AgentDefinition.model_validate(agent_data)
         except Exception as e:
             print(f"Invalid agent configuration: {e}", file=sys.stderr)
             return 1
@@ -910,16 +947,15 @@ async def test_agent(args: argparse.Namespace, settings: Settings) -> int:
         
         # Test with sample event if provided
         if args.event_file:
-            if not args.event_file.exists():
+            if not os.path.exists(args.event_file):
                 print(f"Event file not found: {args.event_file}", file=sys.stderr)
                 return 1
             
-            with open(args.event_file, 'r', encoding='utf-8') as f:
-                event_data = json.load(f)
-            
-            event = GitHubEvent(**event_data)
+            event = GitHubEvent.model_validate_json(
+                await asyncio.to_thread(_read_bytes, args.event_file)
+            )
             context = GitHubActionContext(
-                event_name=event_data.get("event_name", "test"),
+                event_name=(event.model_extra or {}).get("event_name", "test"),
                 workflow="test-workflow",
                 job="test-job",
                 run_id="12345",
@@ -960,10 +996,11 @@ async def test_agent(args: argparse.Namespace, settings: Settings) -> int:
 def show_agent_statistics(args: argparse.Namespace, settings: Settings) -> int:
     """Show agent statistics."""
     try:
+        from .agent_manager import agent_manager
         stats = agent_manager.get_agent_statistics()
         
         if args.format == "json":
-            print(json.dumps(stats, indent=2))
+            _print_json(stats, pretty=True)
         else:
             # Table format
             print("Agent Statistics")
@@ -982,100 +1019,142 @@ def show_agent_statistics(args: argparse.Namespace, settings: Settings) -> int:
         return 1
 
 
+@functools.lru_cache(maxsize=1)
+def _yaml_loader():
+    """Return the libyaml safe loader if available, importing PyYAML on first use."""
+    import yaml
+    return getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def _load_yaml_file(path: str) -> Any:
+    """Parse a YAML file with the fastest available safe loader."""
+    import yaml
+    with open(path, 'rb') as f:
+        return yaml.load(f, Loader=_yaml_loader())
+
+
+# File name suffixes treated as agent definitions
+_YAML_SUFFIXES = (".yml", ".yaml")
+
+# Directories never searched for agent definitions
+_SKIPPED_DIRECTORIES = frozenset({".git", "node_modules", "__pycache__", ".venv"})
+
+# Agent types accepted by agents validate
+_VALID_AGENT_TYPES = frozenset({"codex", "gemini", "claude", "custom"})
+
+# Minimum number of agent files before validation is spread over worker processes.
+# A spawned worker takes ~0.3s to start and import its dependencies while a file
+# validates in ~0.08ms, so two workers only break even at around this size.
+_VALIDATE_PARALLEL_MIN_FILES = 8192
+
+# Number of agent files handed to a worker process per task
+_VALIDATE_BATCH_SIZE = 8
+
+
+def _iter_yaml_files(root: str):
+    """Yield the paths of ``.yml``/``.yaml`` files under ``root``, recursively."""
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in _SKIPPED_DIRECTORIES:
+                    yield from _iter_yaml_files(entry.path)
+            elif entry.name.endswith(_YAML_SUFFIXES):
+                yield entry.path
+
+
+def _validate_agent_file(yaml_file: str) -> Tuple[bool, List[str]]:
+    """Validate a single agent file, returning whether it is valid and any issues."""
+    import yaml
+    from .models import AgentDefinition
+    
+    issues = []
+    try:
+        with open(yaml_file, 'rb') as f:
+            # Zero-length files never reach the YAML parser
+            data = yaml.load(f, Loader=_yaml_loader()) if os.fstat(f.fileno()).st_size else None
+        
+        if not data:
+            return False, [f"{yaml_file}: Empty file"]
+        
+        # Add metadata
+        if "agent" not in data:
+            data["agent"] = {}
+        data["agent"]["file_path"] = yaml_file
+        data["agent"]["file_name"] = os.path.splitext(os.path.basename(yaml_file))[0]
+        
+        # Validate against schema
+        agent_def = AgentDefinition.model_validate(data)
+        
+        # Additional validation
+        agent_type = agent_def.agent.get('type', 'custom')
+        if agent_type not in _VALID_AGENT_TYPES:
+            issues.append(f"{yaml_file}: Unknown agent type '{agent_type}'")
+        
+        # Check CLI availability if not custom
+        # if agent_type != 'custom':
+        #     cli_config = settings.get_agent_cli_config(agent_type)
+        #     if not cli_config:
+        #         issues.append(f"{yaml_file}: No CLI configuration for type '{agent_type}'")
+        
+        return True, issues
+        
+    except yaml.YAMLError as e:
+        return False, [f"{yaml_file}: YAML error - {e}"]
+    except Exception as e:
+        return False, [f"{yaml_file}: Validation error - {e}"]
+
+
+def _validate_agent_files(yaml_files: List[str]) -> List[Tuple[bool, List[str]]]:
+    """Validate a batch of agent files in order."""
+    return [_validate_agent_file(yaml_file) for yaml_file in yaml_files]
+
+
 async def validate_agents(args: argparse.Namespace, settings: Settings) -> int:
     """Validate agent configurations."""
     try:
-        import yaml
-        from pathlib import Path
-        
         # Determine directory to validate
         agents_dir = args.directory or Path(settings.github_workspace) / settings.agents_directory
         
-        if not agents_dir.exists():
+        if not os.path.exists(agents_dir):
             print(f"Agents directory not found: {agents_dir}")
             return 1
         
         print(f"Validating agents in: {agents_dir}")
         print("=" * 50)
         
+        # Find all YAML files in a single walk of the directory tree
+        yaml_files = await asyncio.to_thread(list, _iter_yaml_files(str(agents_dir)))
+        total_files = len(yaml_files)
+        
+        # Parsing and schema validation are CPU bound, so large trees use worker processes
+        if total_files >= _VALIDATE_PARALLEL_MIN_FILES:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            loop = asyncio.get_running_loop()
+            # Never start more workers than there are batches to hand out
+            max_workers = min(os.cpu_count() or 1, -(-total_files // _VALIDATE_BATCH_SIZE))
+            # Spawn rather than fork: the logging threads are already running
+            with ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            ) as executor:
+                batches = await asyncio.gather(*(
+                    loop.run_in_executor(
+                        executor,
+                        _validate_agent_files,
+                        yaml_files[i:i + _VALIDATE_BATCH_SIZE]
+                    )
+                    for i in range(0, total_files, _VALIDATE_BATCH_SIZE)
+                ))
+            results = [result for batch in batches for result in batch]
+        else:
+            results = await asyncio.to_thread(_validate_agent_files, yaml_files)
+        
         issues = []
         valid_agents = 0
-        total_files = 0
-        
-        # Find all YAML files
-        for yaml_file in agents_dir.rglob("*.yml"):
-            total_files += 1
-            try:
-                with open(yaml_file, 'r', encoding='utf-8') as f:
-                    data = yaml.safe_load(f)
-                
-                if not data:
-                    issues.append(f"{yaml_file}: Empty file")
-                    continue
-                
-                # Add metadata
-                if "agent" not in data:
-                    data["agent"] = {}
-                data["agent"]["file_path"] = str(yaml_file)
-                data["agent"]["file_name"] = yaml_file.stem
-                
-                # Validate against schema
-                agent_def = AgentDefinition(**data)
-                
-                # Additional validation
-                agent_type = agent_def.agent.get('type', 'custom')
-                if agent_type not in ['codex', 'gemini', 'claude', 'custom']:
-                    issues.append(f"{yaml_file}: Unknown agent type '{agent_type}'")
-                
-                # Check CLI availability if not custom
-                # if agent_type != 'custom':
-                #     cli_config = settings.get_agent_cli_config(agent_type)
-                #     if not cli_config:
-                #         issues.append(f"{yaml_file}: No CLI configuration for type '{agent_type}'")
-                
-                valid_agents += 1
-                
-            except yaml.YAMLError as e:
-                issues.append(f"{yaml_file}: YAML error - {e}")
-            except Exception as e:
-                issues.append(f"{yaml_file}: Validation error - {e}")
-        
-        for yaml_file in agents_dir.rglob("*.yaml"):
-            total_files += 1
-            try:
-                with open(yaml_file, 'r', encoding='utf-8') as f:
-                    data = yaml.safe_load(f)
-                
-                if not data:
-                    issues.append(f"{yaml_file}: Empty file")
-                    continue
-                
-                # Add metadata
-                if "agent" not in data:
-                    data["agent"] = {}
-                data["agent"]["file_path"] = str(yaml_file)
-                data["agent"]["file_name"] = yaml_file.stem
-                
-                # Validate against schema
-                agent_def = AgentDefinition(**data)
-                
-                # Additional validation
-                agent_type = agent_def.agent.get('type', 'custom')
-                if agent_type not in ['codex', 'gemini', 'claude', 'custom']:
-                    issues.append(f"{yaml_file}: Unknown agent type '{agent_type}'")
-                
-                # Check CLI availability if not custom
-                # if agent_type != 'custom':
-                #     cli_config = settings.get_agent_cli_config(agent_type)
-                #     if not cli_config:
-                #         issues.append(f"{yaml_file}: No CLI configuration for type '{agent_type}'")
-                
-                valid_agents += 1
-                
-            except yaml.YAMLError as e:
-                issues.append(f"{yaml_file}: YAML error - {e}")
-            except Exception as e:
-                issues.append(f"{yaml_file}: Validation error - {e}")
+        for valid, file_issues in results:
+            valid_agents += valid
+            issues.extend(file_issues)
         
         # Results
         print(f"Files Processed:    {total_files}")
@@ -1083,9 +1162,9 @@ async def validate_agents(args: argparse.Namespace, settings: Settings) -> int:
         print(f"Issues Found:       {len(issues)}")
         
         if issues:
-            print("\nIssues:")
-            for i, issue in enumerate(issues, 1):
-                print(f"{i}. {issue}")
+            lines = ["\nIssues:"]
+            lines.extend(f"{i}. {issue}" for i, issue in enumerate(issues, 1))
+            sys.stdout.write("\n".join(lines) + "\n")
             return 1
         else:
             print("\nAll agent configurations are valid!")
@@ -1122,6 +1201,9 @@ async def main():
         return 1
     
     try:
+        from .config import Settings
+        from .logging_config import setup_logging
+        
         # Load settings
         settings = Settings()
         
@@ -1154,19 +1236,28 @@ async def main():
             return 1
             
     except KeyboardInterrupt:
-        if not args.quiet:
-            print("\nInterrupted by user", file=sys.stderr)
+        _print_error(args, "\nInterrupted by user")
         return 130
     except Exception as e:
-        if not args.quiet:
-            print(f"Unexpected error: {e}", file=sys.stderr)
+        _print_error(args, f"Unexpected error: {e}")
         return 1
 
 
+def _run_main() -> int:
+    """Run the async entry point, on uvloop when it is installed."""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(main())
+    
+    with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+        return runner.run(main())
+
+
 def cli():
     """CLI entry point for package installation."""
-    sys.exit(asyncio.run(main()))
+    sys.exit(_run_main())
 
 
 if __name__ == "__main__":
-    sys.exit(asyncio.run(main())) 
\ No newline at end of file
+    sys.exit(_run_main()) 
\ No newline at end of file
@@ -2,9 +2,10 @@
 Pydantic models for GitHub Action events and data structures.
 """
 
+import os
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Mapping, Optional, Union
 
 from pydantic import BaseModel, Field
 
@@ -85,6 +86,10 @@ class GitHubActionTrigger(str, Enum):
     PACKAGE = "package"
 
 
+# Every trigger value, in declaration order
+ALL_TRIGGER_VALUES = tuple(trigger.value for trigger in GitHubActionTrigger)
+
+
 class AgentType(str, Enum):
     """Enumeration of supported AI agent types."""
     
@@ -398,6 +403,30 @@ class GitHubActionContext(BaseModel):
     server_url: str = Field(..., description="GitHub server URL")
     api_url: str = Field(..., description="GitHub API URL")
     graphql_url: str = Field(..., description="GitHub GraphQL URL")
+    
+    @classmethod
+    def from_env(
+        cls,
+        env: Mapping[str, str] = os.environ,
+        workspace: Optional[str] = None
+    ) -> "GitHubActionContext":
+        """Build the context from the GitHub Actions environment variables."""
+        get = env.get
+        return cls(
+            event_name=get("GITHUB_EVENT_NAME", "unknown"),
+            workflow=get("GITHUB_WORKFLOW", "unknown"),
+            job=get("GITHUB_JOB", "unknown"),
+            run_id=get("GITHUB_RUN_ID", "0"),
+            run_number=int(get("GITHUB_RUN_NUMBER") or "0"),
+            actor=get("GITHUB_ACTOR", "unknown"),
+            repository=get("GITHUB_REPOSITORY", "unknown"),
+            ref=get("GITHUB_REF", "refs/heads/main"),
+            sha=get("GITHUB_SHA", "unknown"),
+            workspace=workspace or get("GITHUB_WORKSPACE") or os.getcwd(),
+            server_url=get("GITHUB_SERVER_URL", "https://github.com"),
+            api_url=get("GITHUB_API_URL", "https://api.github.com"),
+            graphql_url=get("GITHUB_GRAPHQL_URL", "https://api.github.com/graphql")
+        )
 
 
 class AgentExecutionResult(BaseModel):